@@ -1,15 +1,62 @@
+import asyncio
+import bisect
 import dataclasses
+import heapq
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from concurrent.futures import Executor
 from dataclasses import dataclass, asdict, astuple
-from string import ascii_letters, ascii_uppercase, ascii_lowercase
+from functools import partial, wraps
+from itertools import islice
+from typing import BinaryIO, Hashable, Iterable, Iterator, Optional
 from uuid import (
     UUID,
     uuid4,
 )
 
-symbols = [str(x) for x in range(0, 10)] + list(ascii_letters)
+_login_pattern = re.compile(r"[0-9A-Za-z]*")
+_password_pattern = re.compile(r"(?=[^0-9]*[0-9])(?=[^a-z]*[a-z])(?=[^A-Z]*[A-Z])[0-9A-Za-z]*")
+# the lookaheads of _password_pattern for many passwords at once, one per line
+_password_lines_pattern = re.compile(r"(?:(?=[^0-9\n]*[0-9])(?=[^a-z\n]*[a-z])(?=[^A-Z\n]*[A-Z])[^\n]*\n)*")
+_uuid_size = 16
+_uuid_version_bits = bytes((byte & 0x0f) | 0x40 for byte in range(256))  # version 4
+_uuid_variant_bits = bytes((byte & 0x3f) | 0x80 for byte in range(256))  # RFC 4122 variant
 
 
-@dataclass
+def _new_ids(count: int) -> list[UUID]:
+    # one os.urandom call for the whole batch instead of one per uuid4();
+    # the version and variant bits are set for all ids at once
+    random_bytes = bytearray(os.urandom(_uuid_size * count))
+    random_bytes[6::_uuid_size] = random_bytes[6::_uuid_size].translate(_uuid_version_bits)
+    random_bytes[8::_uuid_size] = random_bytes[8::_uuid_size].translate(_uuid_variant_bits)
+    random_bytes = bytes(random_bytes)
+
+    return [UUID(bytes=random_bytes[offset:(offset + _uuid_size)])
+            for offset in range(0, len(random_bytes), _uuid_size)]
+
+
+class BatchError(Exception):
+    """
+    Ошибка пакетной операции: ни одна из строк пакета не была применена.
+
+    Attrs:
+        errors: номер строки пакета -> исключение, которое вызвала бы эта строка
+            (ValueError или KeyError), как при поштучном вызове.
+    """
+
+    errors: dict[int, Exception]
+
+    def __init__(self, errors: dict[int, Exception]) -> None:
+        super().__init__(f"{len(errors)} rows of the batch are invalid")
+        self.errors = errors
+
+
+@dataclass(slots=True)
 class Person:
     """
     Информация о пользователе.
@@ -29,13 +76,15 @@ class Person:
 
 class PersonDB:
     _database: dict[UUID, Person]
-    _login_registry: set[str]
+    _login_registry: dict[str, UUID]
+    _username_registry: dict[str, set[UUID]]
     _min_length_password = 10
     _min_length_login = 1
 
     def __init__(self) -> None:
         self._database = dict()
-        self._login_registry = set()
+        self._login_registry = dict()
+        self._username_registry = dict()
 
     def create_person(self, person: Person) -> UUID:
         """
@@ -52,8 +101,7 @@ class PersonDB:
         """
         if self._check_login(person.login) and self._check_password(person.password):
             uuid = uuid4()
-            self._database[uuid] = person
-            self._login_registry.add(person.login)
+            self._insert(uuid, person)
 
             return uuid
 
@@ -93,28 +141,13 @@ class PersonDB:
             KeyError, если в базе данных нет пользователя с person_id.
         """
         if person_id in self._database:
-            login, password, username, metadata = dataclasses.astuple(person_info_new)
+            person = self._merge_update(person_id, person_info_new)
             old_login = self._database[person_id].login
 
-            if password == "":
-                password = self._database[person_id].password
-            if metadata == "":
-                metadata = self._database[person_id].metadata
-            if login == "":
-                login = old_login
-            if username == "":
-                username = self._database[person_id].username
-            if ((login != old_login and self._check_login(login)) or login == old_login) and self._check_password(
-                    password):
-                if login != old_login:
-                    self._login_registry.remove(old_login)
-
-                self._database[person_id] = Person(password=password,
-                                                   login=login,
-                                                   username=username,
-                                                   metadata=metadata
-                                                   )
-                self._login_registry.add(login)
+            if ((person.login != old_login and self._check_login(person.login)) or person.login == old_login) and \
+                    self._check_password(person.password):
+                self._remove(person_id)
+                self._insert(person_id, person)
             else:
 
                 raise ValueError
@@ -132,11 +165,206 @@ class PersonDB:
             KeyError, если в базе данных нет пользователя с person_id.
         """
         if person_id in self._database:
-            self._login_registry.remove(self._database[person_id].login)
-            del self._database[person_id]
+            self._remove(person_id)
         else:
             raise KeyError
 
+    def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        """
+        Создает записи о нескольких пользователях по принципу "все или ничего".
+
+        Args:
+            persons: данные о пользователях, которые будут помещены в БД.
+
+        Returns:
+            Список UUID - идентификаторы созданных записей в порядке persons.
+
+        Raises:
+            BatchError, если хотя бы одна запись не прошла валидацию или повторяет
+                логин, уже встречавшийся в пакете; в errors для таких строк лежит ValueError.
+        """
+        persons = list(persons)
+
+        if not self._is_batch_correct([person.login for person in persons],
+                                      [person.password for person in persons]):
+            errors = dict()
+            batch_logins = set()
+
+            for row, person in enumerate(persons):
+                if person.login in batch_logins or not (
+                        self._check_login(person.login) and self._check_password(person.password)):
+                    errors[row] = ValueError()
+                batch_logins.add(person.login)
+
+            raise BatchError(errors)
+
+        ids = _new_ids(len(persons))
+        for person_id, person in zip(ids, persons):
+            self._insert(person_id, person)
+
+        return ids
+
+    def update_many(self, updates: Iterable[tuple[UUID, Person]]) -> None:
+        """
+        Обновляет данные нескольких пользователей по принципу "все или ничего".
+        Логины внутри пакета можно менять местами: проверяется итоговое состояние БД.
+
+        Args:
+            updates: пары (идентификатор пользователя, модель со значениями на обновление),
+                модель трактуется так же, как в update_person_info.
+
+        Raises:
+            BatchError, если хотя бы одна строка некорректна; в errors лежит KeyError
+                для отсутствующих в БД идентификаторов и ValueError для повторного
+                идентификатора, некорректных или занятых логина или пароля.
+        """
+        updates = list(updates)
+        errors = dict()
+        batch_ids = {person_id for person_id, _ in updates if person_id in self._database}
+        merged = dict()
+        new_logins = set()
+
+        for row, (person_id, person_info_new) in enumerate(updates):
+            if person_id not in self._database:
+                errors[row] = KeyError(person_id)
+                continue
+
+            if person_id in merged:
+                errors[row] = ValueError()
+                continue
+
+            person = self._merge_update(person_id, person_info_new)
+            login_changed = person.login != self._database[person_id].login
+            login_owner = self._login_registry.get(person.login, person_id)
+
+            if person.login in new_logins or (login_owner != person_id and login_owner not in batch_ids) or (
+                    login_changed and not self._is_login_correct(person.login)) or not self._check_password(
+                    person.password):
+                errors[row] = ValueError()
+
+            merged[person_id] = person
+            new_logins.add(person.login)
+
+        if errors:
+            raise BatchError(errors)
+
+        for person_id in merged:
+            self._remove(person_id)
+        for person_id, person in merged.items():
+            self._insert(person_id, person)
+
+    def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        """
+        Удаляет записи о нескольких пользователях по принципу "все или ничего".
+
+        Args:
+            person_ids: идентификаторы пользователей в формате UUID.
+
+        Raises:
+            BatchError, если хотя бы одного идентификатора нет в БД или он повторяется
+                в пакете; в errors для таких строк лежит KeyError.
+        """
+        person_ids = list(person_ids)
+        errors = dict()
+        batch_ids = set()
+
+        for row, person_id in enumerate(person_ids):
+            if person_id not in self._database or person_id in batch_ids:
+                errors[row] = KeyError(person_id)
+            batch_ids.add(person_id)
+
+        if errors:
+            raise BatchError(errors)
+
+        for person_id in person_ids:
+            self._remove(person_id)
+
+    def find_by_login(self, login: str) -> UUID:
+        """
+        Ищет пользователя по логину.
+
+        Args:
+            login: логин пользователя.
+
+        Returns:
+            UUID - идентификатор пользователя с данным логином.
+
+        Raises:
+            KeyError, если в базе данных нет пользователя с таким логином.
+        """
+        return self._login_registry[login]
+
+    def find_by_username(self, username: str) -> set[UUID]:
+        """
+        Ищет пользователей по имени.
+
+        Args:
+            username: имя пользователя.
+
+        Returns:
+            Множество идентификаторов пользователей с данным именем
+            (пустое, если таких пользователей нет).
+        """
+        return set(self._username_registry.get(username, ()))
+
+    def _merge_update(self, person_id: UUID, person_info_new: Person) -> Person:
+        """
+        Совмещает текущую запись с моделью на обновление: пустые поля модели
+        заменяются значениями из БД.
+
+        Args:
+            person_id: идентификатор пользователя в формате UUID.
+            person_info_new: модель со значениями на обновление.
+
+        Returns:
+            Итоговые данные о пользователе (без валидации).
+        """
+        login, password, username, metadata = dataclasses.astuple(person_info_new)
+        old_person = self._database[person_id]
+
+        return Person(login=login or old_person.login,
+                      password=password or old_person.password,
+                      username=username or old_person.username,
+                      metadata=metadata or old_person.metadata
+                      )
+
+    def _insert(self, person_id: UUID, person: Person) -> None:
+        """
+        Помещает запись в базу данных и в индексы по логину и имени.
+        Запись хранится без копирования; имя и метаданные часто повторяются,
+        поэтому заменяются интернированными строками с тем же значением.
+
+        Args:
+            person_id: идентификатор пользователя в формате UUID.
+            person: данные о пользователе.
+        """
+        person.username = sys.intern(person.username)
+        person.metadata = sys.intern(person.metadata)
+
+        self._database[person_id] = person
+        self._login_registry[person.login] = person_id
+        self._username_registry.setdefault(person.username, set()).add(person_id)
+
+    def _remove(self, person_id: UUID) -> Person:
+        """
+        Удаляет запись из базы данных и из индексов.
+
+        Args:
+            person_id: идентификатор пользователя в формате UUID.
+
+        Returns:
+            Удаленная запись о пользователе.
+        """
+        record = self._database.pop(person_id)
+        del self._login_registry[record.login]
+
+        ids = self._username_registry[record.username]
+        ids.discard(person_id)
+        if not ids:
+            del self._username_registry[record.username]
+
+        return record
+
     def _check_login(self, login: str) -> bool:
         """
         Проверяет, существует ли в базе данных данный login и является ли login корректным.
@@ -148,21 +376,57 @@ class PersonDB:
             True, если login присутствует в базе данных логинов.
             False, если login отсутсвтует в базе данных логинов или не является корректным.
         """
-        if login not in self._login_registry and all(x in symbols for x in login) and len(
-                login) >= self._min_length_login:
+        return login not in self._login_registry and self._is_login_correct(login)
+
+    def _is_login_correct(self, login: str) -> bool:
+        """
+        Проверяет формат логина: только цифры и буквы английского алфавита,
+        не менее _min_length_login символов.
+
+        Args:
+            login: логин пользователя
+
+        Returns:
+            True, если login имеет корректный формат, иначе False.
+        """
+        return len(login) >= self._min_length_login and _login_pattern.fullmatch(login) is not None
+
+    def _is_batch_correct(self, logins: list[str], passwords: list[str]) -> bool:
+        """
+        Проверяет пакет целиком несколькими проходами на уровне C вместо
+        проверки каждой строки: логины уникальны, свободны и корректны,
+        пароли корректны. Какие именно строки некорректны, не сообщает.
+
+        Args:
+            logins: логины пакета.
+            passwords: пароли пакета в том же порядке.
+
+        Returns:
+            True, если каждая строка прошла бы _check_login и _check_password
+            и логины в пакете не повторяются, иначе False.
+        """
+        if not logins:
             return True
 
-        return False
+        # concatenated strings of [0-9A-Za-z]* match it exactly when every string does,
+        # which also rules out line breaks inside the passwords below
+        return (len(set(logins)) == len(logins)
+                and self._login_registry.keys().isdisjoint(logins)
+                and min(map(len, logins)) >= self._min_length_login
+                and _login_pattern.fullmatch("".join(logins)) is not None
+                and min(map(len, passwords)) >= self._min_length_password
+                and _login_pattern.fullmatch("".join(passwords)) is not None
+                and _password_lines_pattern.fullmatch("\n".join(passwords) + "\n") is not None)
 
     def _check_password(self, password: str) -> bool:
         """
         Проверяет, является ли password пользователя корректным.
         Пароль корректен, если:
-            (conditions[0]) пароль содержит хотя бы одну цифру от 0 до 9
-            (conditions[1]) пароль содержит хотя бы одну букву английского алфавита в нижнем регистре
-            (conditions[2]) пароль содержит хотя бы одну букву английского алфавита в верхнем регистре
-            (conditions[3]) пароль не содержит никаких символов, кроме разрешенных(ascii_letters and digits)
-                            пароль состоит не менее чем из 10 символов
+            пароль содержит хотя бы одну цифру от 0 до 9
+            пароль содержит хотя бы одну букву английского алфавита в нижнем регистре
+            пароль содержит хотя бы одну букву английского алфавита в верхнем регистре
+            пароль не содержит никаких символов, кроме разрешенных(ascii_letters and digits)
+            пароль состоит не менее чем из 10 символов
 
         Args:
             password: пароль пользователя
@@ -171,18 +435,713 @@ class PersonDB:
             True, если пароль является корректным.
             False, если пароль не является корректным.
         """
-        conditions = [False] * 4
-        conditions[3] = True
-        if len(password) >= self._min_length_password:
-            for x in password:
-                if x.isdigit():
-                    conditions[0] = True
-                elif x.islower():
-                    conditions[1] = True
-                elif x.isupper():
-                    conditions[2] = True
-                conditions[3] *= x.isascii()
+        return len(password) >= self._min_length_password and _password_pattern.fullmatch(password) is not None
+
+
+_SNAPSHOT_MAGIC = b"PDBS"
+_LOG_MAGIC = b"PDBL"
+_snapshot_header = struct.Struct("<4sQQ")  # magic, generation, number of records
+_log_header = struct.Struct("<4sQ")  # magic, generation
+_frame_header = struct.Struct("<II")  # payload length, crc32 of payload
+_record_header = struct.Struct("<16s4I")  # uuid, byte lengths of login, password, username, metadata
+_op_insert = b"\x00"
+_op_remove = b"\x01"
+
+
+def _pack_person(person_id: UUID, person: Person) -> bytes:
+    fields = [field.encode() for field in (person.login, person.password, person.username, person.metadata)]
+
+    return _record_header.pack(person_id.bytes, *(len(field) for field in fields)) + b"".join(fields)
+
+
+def _unpack_person(buffer: mmap.mmap, offset: int) -> tuple[UUID, Person, int]:
+    person_id, *lengths = _record_header.unpack_from(buffer, offset)
+    offset += _record_header.size
+
+    fields = []
+    for length in lengths:
+        fields.append(buffer[offset:(offset + length)].decode())
+        offset += length
+
+    return UUID(bytes=person_id), Person(*fields), offset
+
+
+def _fsync_directory(path: str) -> None:
+    # os.replace survives a power loss only once the directory entry is on disk
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _committed(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._check_open()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._commit()
+
+    return wrapper
+
+
+class PersistentPersonDB(PersonDB):
+    """
+    База данных пользователей, сохраняемая на диск.
+
+    Каждая изменяющая операция дописывается в журнал (wal.log) одним кадром с
+    контрольной суммой и передается ОС до возврата из метода, поэтому падение
+    процесса ее не теряет. fsync же выполняется только раз в sync_every операций:
+    при отключении питания или сбое ОС могут пропасть до sync_every - 1 последних
+    операций, о которых вызывающий уже получил подтверждение. sync_every=1
+    выполняет fsync перед каждым подтверждением.
+    Снимок (snapshot.bin) хранит все записи в компактном двоичном виде; после его
+    записи журнал начинается заново. При запуске снимок читается через mmap,
+    а из журнала применяются только целые кадры текущего поколения.
+    """
+
+    _path: str
+    _log: Optional[BinaryIO]
+    _generation: int
+    _pending: list[bytes]
+    _commits_since_sync: int
+    _commits_since_snapshot: int
+    sync_every: int
+    snapshot_every: Optional[int]
+
+    def __init__(self, path: str, sync_every: int = 64, snapshot_every: Optional[int] = None) -> None:
+        if sync_every < 1 or (snapshot_every is not None and snapshot_every < 1):
+            raise ValueError
+
+        super().__init__()
+        self._path = path
+        self._log = None
+        self._pending = []
+        self._commits_since_sync = 0
+        self._commits_since_snapshot = 0
+        self.sync_every = sync_every
+        self.snapshot_every = snapshot_every
+
+        os.makedirs(path, exist_ok=True)
+        self._generation = self._load_snapshot()
+        log_end = self._replay_log()
+
+        if log_end is None:
+            self._start_log(self._generation)
         else:
-            return False
+            self._log = open(self._log_path, "r+b")
+            self._log.truncate(log_end)
+            self._log.seek(log_end)
+
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self._path, "snapshot.bin")
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self._path, "wal.log")
+
+    create_person = _committed(PersonDB.create_person)
+    update_person_info = _committed(PersonDB.update_person_info)
+    delete_person = _committed(PersonDB.delete_person)
+    create_many = _committed(PersonDB.create_many)
+    update_many = _committed(PersonDB.update_many)
+    delete_many = _committed(PersonDB.delete_many)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def sync(self) -> None:
+        """
+        Сбрасывает журнал на диск (fsync).
+
+        Raises:
+            ValueError, если база данных уже закрыта.
+        """
+        self._check_open()
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._commits_since_sync = 0
+
+    def close(self) -> None:
+        """
+        Сбрасывает журнал на диск и закрывает его.
+        """
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._log = None
+
+    def snapshot(self) -> None:
+        """
+        Записывает снимок всей базы данных и начинает новый пустой журнал.
+        Снимок пишется во временный файл и атомарно подменяет предыдущий.
+
+        Raises:
+            ValueError, если база данных уже закрыта.
+        """
+        self._check_open()
+        generation = self._generation + 1
+        temp_path = self._snapshot_path + ".tmp"
+
+        with open(temp_path, "wb") as file:
+            file.write(_snapshot_header.pack(_SNAPSHOT_MAGIC, generation, len(self._database)))
+            for person_id, person in self._database.items():
+                file.write(_pack_person(person_id, person))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self._snapshot_path)
+        _fsync_directory(self._path)
+        # until the new log appears, the old one is ignored as stale by its generation
+        self._log.close()
+        self._start_log(generation)
+        self._generation = generation
+        self._commits_since_snapshot = 0
+
+    def _check_open(self) -> None:
+        if self._log is None:
+            raise ValueError(f"database {self._path} is closed")
+
+    def _insert(self, person_id: UUID, person: Person) -> None:
+        super()._insert(person_id, person)
+        self._pending.append(_op_insert + _pack_person(person_id, person))
+
+    def _remove(self, person_id: UUID) -> Person:
+        record = super()._remove(person_id)
+        self._pending.append(_op_remove + person_id.bytes)
+
+        return record
+
+    def _commit(self) -> None:
+        if not self._pending:
+            return
+
+        payload = b"".join(self._pending)
+        self._pending = []
+        self._log.write(_frame_header.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._log.flush()
+
+        self._commits_since_sync += 1
+        self._commits_since_snapshot += 1
+
+        if self._commits_since_sync >= self.sync_every:
+            self.sync()
+
+        if self.snapshot_every is not None and self._commits_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _start_log(self, generation: int) -> None:
+        temp_path = self._log_path + ".tmp"
+
+        with open(temp_path, "wb") as file:
+            file.write(_log_header.pack(_LOG_MAGIC, generation))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self._log_path)
+        _fsync_directory(self._path)
+        self._log = open(self._log_path, "r+b")
+        self._log.seek(0, os.SEEK_END)
+
+    def _load_snapshot(self) -> int:
+        if not os.path.exists(self._snapshot_path):
+            return 0
+
+        with open(self._snapshot_path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, generation, count = _snapshot_header.unpack_from(buffer, 0)
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError(f"{self._snapshot_path} is not a snapshot")
+
+            offset = _snapshot_header.size
+            for _ in range(count):
+                person_id, person, offset = _unpack_person(buffer, offset)
+                PersonDB._insert(self, person_id, person)
+
+        return generation
+
+    def _replay_log(self) -> Optional[int]:
+        """
+        Применяет журнал текущего поколения.
+
+        Returns:
+            Смещение конца последнего целого кадра или None, если журнала нет
+            или он относится к предыдущему поколению.
+        """
+        if not os.path.exists(self._log_path) or os.path.getsize(self._log_path) < _log_header.size:
+            return None
+
+        with open(self._log_path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, generation = _log_header.unpack_from(buffer, 0)
+            if magic != _LOG_MAGIC or generation != self._generation:
+                return None
+
+            offset = _log_header.size
+            while offset + _frame_header.size <= len(buffer):
+                length, checksum = _frame_header.unpack_from(buffer, offset)
+                start, end = offset + _frame_header.size, offset + _frame_header.size + length
+                # a torn or corrupted tail frame was never acknowledged: drop it
+                if end > len(buffer) or zlib.crc32(buffer[start:end]) != checksum:
+                    break
+
+                self._apply_frame(buffer, start, end)
+                offset = end
+
+        return offset
+
+    def _apply_frame(self, buffer: mmap.mmap, offset: int, end: int) -> None:
+        while offset < end:
+            op = buffer[offset:(offset + 1)]
+            offset += 1
+
+            if op == _op_insert:
+                person_id, person, offset = _unpack_person(buffer, offset)
+                PersonDB._insert(self, person_id, person)
+            else:
+                PersonDB._remove(self, UUID(bytes=buffer[offset:(offset + _uuid_size)]))
+                offset += _uuid_size
+
+
+class _HeldLocks:
+    """
+    Контекстный менеджер, захватывающий блокировки в заданном порядке
+    и освобождающий их в обратном.
+    """
+
+    __slots__ = ("_locks",)
+
+    _locks: list[threading.Lock]
+
+    def __init__(self, locks: list[threading.Lock]) -> None:
+        self._locks = locks
+
+    def __enter__(self) -> None:
+        acquired = 0
+        try:
+            for lock in self._locks:
+                lock.acquire()
+                acquired += 1
+        except BaseException:
+            for lock in reversed(self._locks[:acquired]):
+                lock.release()
+            raise
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        for lock in reversed(self._locks):
+            lock.release()
+
+
+class _StripedLocks:
+    """
+    Набор блокировок, между которыми ключи распределяются по хешу.
+    Несколько блокировок всегда берутся в порядке возрастания номера, поэтому
+    потоки, захватывающие пересекающиеся наборы ключей, не попадают в deadlock.
+    """
+
+    _locks: list[threading.Lock]
+
+    def __init__(self, stripes: int) -> None:
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def hold(self, keys: Iterable[Hashable]) -> _HeldLocks:
+        # a plain class instead of @contextmanager and ExitStack: every operation
+        # takes two to four of these, and the generator machinery cost more than the locks
+        locks = self._locks
+        stripes = len(locks)
+
+        return _HeldLocks([locks[index] for index in sorted({hash(key) % stripes for key in keys})])
+
+
+class ConcurrentPersonDB(PersonDB):
+    """
+    Потокобезопасная база данных пользователей.
+
+    Операции блокируют только полосы (stripes), соответствующие затронутым
+    идентификаторам и логинам, поэтому несвязанные операции выполняются параллельно.
+    Порядок захвата: блокировки идентификаторов, затем логинов, затем имен.
+    """
+
+    _id_locks: _StripedLocks
+    _login_locks: _StripedLocks
+    _username_locks: _StripedLocks
+
+    def __init__(self, stripes: int = 64) -> None:
+        if stripes < 1:
+            raise ValueError
+
+        super().__init__()
+        self._id_locks = _StripedLocks(stripes)
+        self._login_locks = _StripedLocks(stripes)
+        self._username_locks = _StripedLocks(stripes)
+
+    def create_person(self, person: Person) -> UUID:
+        with self._login_locks.hold([person.login]):
+            return super().create_person(person)
+
+    def read_person_info(self, person_id: UUID) -> Person:
+        with self._id_locks.hold([person_id]):
+            return super().read_person_info(person_id)
+
+    def update_person_info(self, person_id: UUID, person_info_new: Person) -> None:
+        with self._id_locks.hold([person_id]), self._login_locks.hold(
+                [person_info_new.login, *self._current_logins([person_id])]):
+            super().update_person_info(person_id, person_info_new)
+
+    def delete_person(self, person_id: UUID) -> None:
+        with self._id_locks.hold([person_id]), self._login_locks.hold(self._current_logins([person_id])):
+            super().delete_person(person_id)
+
+    def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        persons = list(persons)
+
+        with self._login_locks.hold(person.login for person in persons):
+            return super().create_many(persons)
+
+    def update_many(self, updates: Iterable[tuple[UUID, Person]]) -> None:
+        updates = list(updates)
+        person_ids = [person_id for person_id, _ in updates]
+        new_logins = [person_info_new.login for _, person_info_new in updates]
+
+        with self._id_locks.hold(person_ids), self._login_locks.hold(
+                new_logins + self._current_logins(person_ids)):
+            super().update_many(updates)
+
+    def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        person_ids = list(person_ids)
+
+        with self._id_locks.hold(person_ids), self._login_locks.hold(self._current_logins(person_ids)):
+            super().delete_many(person_ids)
+
+    def find_by_login(self, login: str) -> UUID:
+        with self._login_locks.hold([login]):
+            return super().find_by_login(login)
+
+    def find_by_username(self, username: str) -> set[UUID]:
+        with self._username_locks.hold([username]):
+            return super().find_by_username(username)
+
+    def _current_logins(self, person_ids: Iterable[UUID]) -> list[str]:
+        """
+        Возвращает текущие логины пользователей; вызывается под блокировками их
+        идентификаторов, поэтому логины не могут измениться до конца операции.
+        """
+        records = (self._database.get(person_id) for person_id in person_ids)
+
+        return [record.login for record in records if record is not None]
+
+    def _insert(self, person_id: UUID, person: Person) -> None:
+        with self._username_locks.hold([person.username]):
+            super()._insert(person_id, person)
+
+    def _remove(self, person_id: UUID) -> Person:
+        with self._username_locks.hold([self._database[person_id].username]):
+            return super()._remove(person_id)
+
+
+class AsyncPersonDB:
+    """
+    Асинхронный фасад над ConcurrentPersonDB: каждая операция выполняется
+    в пуле потоков и не блокирует цикл событий.
+    """
+
+    _db: ConcurrentPersonDB
+    _executor: Optional[Executor]
+
+    def __init__(self, db: Optional[ConcurrentPersonDB] = None, executor: Optional[Executor] = None) -> None:
+        self._db = ConcurrentPersonDB() if db is None else db
+        self._executor = executor
+
+    async def _run(self, method, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(method, *args))
+
+    async def create_person(self, person: Person) -> UUID:
+        return await self._run(self._db.create_person, person)
+
+    async def read_person_info(self, person_id: UUID) -> Person:
+        return await self._run(self._db.read_person_info, person_id)
+
+    async def update_person_info(self, person_id: UUID, person_info_new: Person) -> None:
+        await self._run(self._db.update_person_info, person_id, person_info_new)
+
+    async def delete_person(self, person_id: UUID) -> None:
+        await self._run(self._db.delete_person, person_id)
+
+    async def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        return await self._run(self._db.create_many, list(persons))
+
+    async def update_many(self, updates: Iterable[tuple[UUID, Person]]) -> None:
+        await self._run(self._db.update_many, list(updates))
+
+    async def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        await self._run(self._db.delete_many, list(person_ids))
+
+    async def find_by_login(self, login: str) -> UUID:
+        return await self._run(self._db.find_by_login, login)
+
+    async def find_by_username(self, username: str) -> set[UUID]:
+        return await self._run(self._db.find_by_username, username)
+
+
+_ngram_size = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i:(i + _ngram_size)] for i in range(len(text) - _ngram_size + 1)}
+
+
+class _SortedStrings:
+    """
+    Отсортированный набор строк, разбитый на блоки ограниченного размера.
+
+    Вставка и удаление стоят O(log n + _block_size) вместо O(n) у одного
+    списка; пакет строк добавляется слиянием с одной сортировкой.
+    """
+
+    _block_size = 1024
+    _blocks: list[list[str]]
+    _maxes: list[str]  # последняя строка каждого блока
+    _length: int
+
+    def __init__(self) -> None:
+        self._blocks = []
+        self._maxes = []
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[str]:
+        for block in self._blocks:
+            yield from block
+
+    def add(self, value: str) -> None:
+        self._length += 1
+
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+
+        index = min(bisect.bisect_left(self._maxes, value), len(self._maxes) - 1)
+        block = self._blocks[index]
+        bisect.insort(block, value)
+        self._maxes[index] = block[-1]
+
+        if len(block) > 2 * self._block_size:
+            self._blocks[index:(index + 1)] = [block[:self._block_size], block[self._block_size:]]
+            self._maxes[index:(index + 1)] = [block[self._block_size - 1], block[-1]]
+
+    def update(self, values: list[str]) -> None:
+        if len(values) < len(self) // 8:
+            for value in values:
+                self.add(value)
+            return
+
+        merged = [*self, *values]
+        merged.sort()
+        self._blocks = [merged[start:(start + self._block_size)] for start in range(0, len(merged), self._block_size)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._length = len(merged)
+
+    def remove(self, value: str) -> None:
+        index = bisect.bisect_left(self._maxes, value)
+        block = self._blocks[index]
+        del block[bisect.bisect_left(block, value)]
+        self._length -= 1
+
+        if block:
+            self._maxes[index] = block[-1]
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+
+    def next(self, value: str, inclusive: bool) -> Optional[str]:
+        """
+        Возвращает наименьшую строку, не меньшую value (inclusive) или строго
+        большую value, либо None, если такой строки нет.
+        """
+        search = bisect.bisect_left if inclusive else bisect.bisect_right
+
+        index = search(self._maxes, value)
+        if index == len(self._maxes):
+            return None
+
+        block = self._blocks[index]
+        return block[search(block, value)]
+
+
+class SearchablePersonDB(PersonDB):
+    """
+    База данных пользователей с поиском по префиксу логина и подстроке имени
+    и метаданных.
+
+    Логины хранятся в блочном отсортированном наборе, имена и метаданные - в
+    индексах триграмм; все индексы обновляются в _insert и _remove. Подстроки
+    короче трех символов не покрываются индексом и проверяются перебором.
+    """
+
+    # if at least this share of all users matches the trigrams, search walks
+    # the sorted logins instead of ordering the candidates
+    _dense_candidates_ratio = 1 / 16
+    _sorted_logins: _SortedStrings
+    _pending_logins: Optional[list[str]]  # logins of create_many, added to the index at once
+    _username_ngrams: dict[str, set[UUID]]
+    _metadata_ngrams: dict[str, set[UUID]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._sorted_logins = _SortedStrings()
+        self._pending_logins = None
+        self._username_ngrams = dict()
+        self._metadata_ngrams = dict()
+
+    def search(
+            self,
+            login_prefix: str = "",
+            username_contains: str = "",
+            metadata_contains: str = "",
+            after: Optional[str] = None,
+    ) -> Iterator[tuple[UUID, Person]]:
+        """
+        Лениво перебирает пользователей, удовлетворяющих всем условиям, в порядке
+        возрастания логина. Пустая строка в условии означает отсутствие условия.
+
+        Args:
+            login_prefix: логин начинается с этой строки.
+            username_contains: имя содержит эту подстроку.
+            metadata_contains: метаданные содержат эту подстроку.
+            after: курсор - выдаются только логины строго больше after.
+
+        Returns:
+            Итератор пар (идентификатор, данные о пользователе).
+        """
+        candidates = self._ngram_candidates(username_contains, metadata_contains)
+
+        if candidates is None:
+            logins = self._iter_logins(login_prefix, after)
+        elif len(candidates) >= self._dense_candidates_ratio * len(self._database):
+            logins = (login for login in self._iter_logins(login_prefix, after)
+                      if self._login_registry.get(login) in candidates)
+        else:
+            logins = self._iter_candidate_logins(candidates, login_prefix, after)
+
+        for login in logins:
+            person_id = self._login_registry.get(login)
+            if person_id is None:
+                continue
+
+            person = self._database[person_id]
+            if person.login.startswith(login_prefix) and username_contains in person.username and \
+                    metadata_contains in person.metadata:
+                yield person_id, person
+
+    def search_page(
+            self,
+            login_prefix: str = "",
+            username_contains: str = "",
+            metadata_contains: str = "",
+            cursor: Optional[str] = None,
+            page_size: int = 50,
+    ) -> tuple[list[tuple[UUID, Person]], Optional[str]]:
+        """
+        Возвращает одну страницу результатов search.
+
+        Args:
+            login_prefix, username_contains, metadata_contains: условия, как в search.
+            cursor: курсор, полученный с предыдущей страницы (None - первая страница).
+            page_size: максимальное число записей на странице.
+
+        Returns:
+            Записи страницы и курсор следующей страницы (None, если страница последняя).
+
+        Raises:
+            ValueError, если page_size меньше 1.
+        """
+        if page_size < 1:
+            raise ValueError
+
+        page = list(islice(self.search(login_prefix, username_contains, metadata_contains, cursor), page_size))
+        next_cursor = page[-1][1].login if len(page) == page_size else None
+
+        return page, next_cursor
+
+    def _iter_logins(self, login_prefix: str, after: Optional[str]) -> Iterator[str]:
+        # the position is looked up again before every step,
+        # so the database may change between two yields
+        if after is None or after < login_prefix:
+            login = self._sorted_logins.next(login_prefix, inclusive=True)
+        else:
+            login = self._sorted_logins.next(after, inclusive=False)
+
+        while login is not None and login.startswith(login_prefix):
+            yield login
+            login = self._sorted_logins.next(login, inclusive=False)
+
+    def _iter_candidate_logins(
+            self,
+            candidates: set[UUID],
+            login_prefix: str,
+            after: Optional[str],
+    ) -> Iterator[str]:
+        # a heap is built in O(len(candidates)) and then popped only as far
+        # as the caller reads, so a page does not sort all candidates
+        logins = [
+            login for login in (self._database[person_id].login for person_id in candidates
+                                if person_id in self._database)
+            if login.startswith(login_prefix) and (after is None or login > after)
+        ]
+        heapq.heapify(logins)
+
+        while logins:
+            yield heapq.heappop(logins)
+
+    def _ngram_candidates(self, username_contains: str, metadata_contains: str) -> Optional[set[UUID]]:
+        candidates = None
+
+        for index, text in ((self._username_ngrams, username_contains), (self._metadata_ngrams, metadata_contains)):
+            for ngram in sorted(_ngrams(text), key=lambda x: len(index.get(x, ()))):
+                ids = index.get(ngram, set())
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return candidates
+
+        return candidates
+
+    def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        self._pending_logins = []
+        try:
+            return super().create_many(persons)
+        finally:
+            logins, self._pending_logins = self._pending_logins, None
+            self._sorted_logins.update(logins)
+
+    def _insert(self, person_id: UUID, person: Person) -> None:
+        super()._insert(person_id, person)
+        if self._pending_logins is None:
+            self._sorted_logins.add(person.login)
+        else:
+            self._pending_logins.append(person.login)
+
+        for index, text in ((self._username_ngrams, person.username), (self._metadata_ngrams, person.metadata)):
+            for ngram in _ngrams(text):
+                index.setdefault(ngram, set()).add(person_id)
+
+    def _remove(self, person_id: UUID) -> Person:
+        record = super()._remove(person_id)
+        self._sorted_logins.remove(record.login)
+
+        for index, text in ((self._username_ngrams, record.username), (self._metadata_ngrams, record.metadata)):
+            for ngram in _ngrams(text):
+                ids = index[ngram]
+                ids.discard(person_id)
+                if not ids:
+                    del index[ngram]
 
-        return all(conditions) and password.isalnum()
+        return record
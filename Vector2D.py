@@ -1,10 +1,16 @@
 from dataclasses import dataclass
 from math import acos, pi
-from typing import Union
+from typing import Iterable, Union
 from numbers import Real
 
+import numpy as np
+
+_plain_numbers = (float, int)  # checked by type() before the slower isinstance(other, Real)
+
 
 class Vector2D:
+    __slots__ = ("_abscissa", "_ordinate")
+
     _ordinate: float
     _abscissa: float
 
@@ -49,7 +55,7 @@ class Vector2D:
         return abs(self) > 0
 
     def __mul__(self, other: Real) -> 'Vector2D':
-        if not isinstance(other, Real):
+        if type(other) not in _plain_numbers and not isinstance(other, Real):
             return NotImplemented
 
         return Vector2D(self._abscissa * other, self._ordinate * other)
@@ -58,19 +64,19 @@ class Vector2D:
         return self * other
 
     def __add__(self, other: Union[Real, 'Vector2D']) -> 'Vector2D':
-        if isinstance(other, Real):
-            return Vector2D(self._abscissa + other, self._ordinate + other)
-
-        if isinstance(other, Vector2D):
+        if type(other) is Vector2D or (type(other) not in _plain_numbers and isinstance(other, Vector2D)):
             return Vector2D(self._abscissa + other._abscissa, self._ordinate + other._ordinate)
 
+        if type(other) in _plain_numbers or isinstance(other, Real):
+            return Vector2D(self._abscissa + other, self._ordinate + other)
+
         return NotImplemented
 
     def __radd__(self, other) -> 'Vector2D':
         return self + other
 
     def __truediv__(self, other: Real) -> 'Vector2D':
-        if not isinstance(other, Real):
+        if type(other) not in _plain_numbers and not isinstance(other, Real):
             return NotImplemented
 
         return self * (1 / other)
@@ -79,17 +85,56 @@ class Vector2D:
         return Vector2D(-self._abscissa, -self._ordinate)
 
     def __sub__(self, other: Union['Vector2D', Real]) -> 'Vector2D':
-        if isinstance(other, Real):
-            return Vector2D(self._abscissa - other, self._ordinate - other)
-
-        if isinstance(other, Vector2D):
+        if type(other) is Vector2D or (type(other) not in _plain_numbers and isinstance(other, Vector2D)):
             return Vector2D(self._abscissa - other._abscissa, self._ordinate - other._ordinate)
 
+        if type(other) in _plain_numbers or isinstance(other, Real):
+            return Vector2D(self._abscissa - other, self._ordinate - other)
+
         return NotImplemented
 
     def __rsub__(self, other: Union['Vector2D', Real]) -> 'Vector2D':
         return -self + other
 
+    def __iadd__(self, other: Union[Real, 'Vector2D']) -> 'Vector2D':
+        if type(other) is Vector2D or (type(other) not in _plain_numbers and isinstance(other, Vector2D)):
+            self._abscissa += other._abscissa
+            self._ordinate += other._ordinate
+        elif type(other) in _plain_numbers or isinstance(other, Real):
+            self._abscissa += other
+            self._ordinate += other
+        else:
+            return NotImplemented
+
+        return self
+
+    def __isub__(self, other: Union[Real, 'Vector2D']) -> 'Vector2D':
+        if type(other) is Vector2D or (type(other) not in _plain_numbers and isinstance(other, Vector2D)):
+            self._abscissa -= other._abscissa
+            self._ordinate -= other._ordinate
+        elif type(other) in _plain_numbers or isinstance(other, Real):
+            self._abscissa -= other
+            self._ordinate -= other
+        else:
+            return NotImplemented
+
+        return self
+
+    def __imul__(self, other: Real) -> 'Vector2D':
+        if type(other) not in _plain_numbers and not isinstance(other, Real):
+            return NotImplemented
+
+        self._abscissa *= other
+        self._ordinate *= other
+
+        return self
+
+    def __itruediv__(self, other: Real) -> 'Vector2D':
+        if type(other) not in _plain_numbers and not isinstance(other, Real):
+            return NotImplemented
+
+        return self.__imul__(1 / other)
+
     def __complex__(self) -> complex:
         return complex(real=self._abscissa, imag=self._ordinate)
 
@@ -115,4 +160,229 @@ class Vector2D:
         return acos(self @ other / (abs(self) * abs(other))) * 180 / pi
 
     def conjugate(self) -> 'Vector2D':
-        return Vector2D(self._abscissa, -self._ordinate)
\ No newline at end of file
+        return Vector2D(self._abscissa, -self._ordinate)
+
+
+class Vector2DArray:
+    """
+    Structure of arrays: vector i is (abscissa[i], ordinate[i]).
+    Operations mirror Vector2D and are applied to all vectors at once.
+    """
+
+    # numpy operands on the left would otherwise treat the class as a sequence
+    # and build an object array of Vector2D; None makes them defer to __radd__ etc.
+    __array_ufunc__ = None
+
+    _abscissa: np.ndarray
+    _ordinate: np.ndarray
+
+    def __init__(self, abscissa: np.ndarray, ordinate: np.ndarray) -> None:
+        # copies: the in-place operators must not write through the caller's arrays
+        self._abscissa = np.array(abscissa, dtype=np.float64)
+        self._ordinate = np.array(ordinate, dtype=np.float64)
+        self._check_shapes()
+
+    @classmethod
+    def from_arrays(cls, abscissa: np.ndarray, ordinate: np.ndarray) -> 'Vector2DArray':
+        """Wrap two float64 arrays without copying: in-place operators write through to them."""
+        vectors = cls.__new__(cls)
+        vectors._abscissa = np.asarray(abscissa, dtype=np.float64)
+        vectors._ordinate = np.asarray(ordinate, dtype=np.float64)
+        vectors._check_shapes()
+
+        # += on one component would silently change the other
+        if np.shares_memory(vectors._abscissa, vectors._ordinate):
+            raise ValueError("abscissa and ordinate must not share memory")
+
+        return vectors
+
+    def _check_shapes(self) -> None:
+        if self._abscissa.ndim != 1 or self._abscissa.shape != self._ordinate.shape:
+            raise ValueError("abscissa and ordinate must be 1-D arrays of the same length")
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector2D]) -> 'Vector2DArray':
+        vectors = list(vectors)
+
+        return cls.from_arrays(np.fromiter((v.abscissa for v in vectors), dtype=np.float64, count=len(vectors)),
+                               np.fromiter((v.ordinate for v in vectors), dtype=np.float64, count=len(vectors)))
+
+    @property
+    def abscissa(self) -> np.ndarray:
+        return self._abscissa
+
+    @property
+    def ordinate(self) -> np.ndarray:
+        return self._ordinate
+
+    def __len__(self) -> int:
+        return len(self._abscissa)
+
+    def __getitem__(self, i: int) -> Vector2D:
+        return Vector2D(self._abscissa[i], self._ordinate[i])
+
+    def __iter__(self):
+        return (Vector2D(x, y) for x, y in zip(self._abscissa.tolist(), self._ordinate.tolist()))
+
+    @staticmethod
+    def _components(other: Union[Real, np.ndarray, Vector2D, 'Vector2DArray']):
+        if isinstance(other, (Vector2D, Vector2DArray)):
+            return other.abscissa, other.ordinate
+
+        if isinstance(other, (Real, np.ndarray)):
+            return other, other
+
+        return None
+
+    def __add__(self, other: Union[Real, Vector2D, 'Vector2DArray']) -> 'Vector2DArray':
+        components = self._components(other)
+        if components is None:
+            return NotImplemented
+
+        return Vector2DArray.from_arrays(self._abscissa + components[0], self._ordinate + components[1])
+
+    def __radd__(self, other) -> 'Vector2DArray':
+        return self + other
+
+    def __sub__(self, other: Union[Real, Vector2D, 'Vector2DArray']) -> 'Vector2DArray':
+        components = self._components(other)
+        if components is None:
+            return NotImplemented
+
+        return Vector2DArray.from_arrays(self._abscissa - components[0], self._ordinate - components[1])
+
+    def __rsub__(self, other) -> 'Vector2DArray':
+        return -self + other
+
+    def __neg__(self) -> 'Vector2DArray':
+        return Vector2DArray.from_arrays(-self._abscissa, -self._ordinate)
+
+    def __mul__(self, other: Union[Real, np.ndarray]) -> 'Vector2DArray':
+        if not isinstance(other, (Real, np.ndarray)):
+            return NotImplemented
+
+        return Vector2DArray.from_arrays(self._abscissa * other, self._ordinate * other)
+
+    def __rmul__(self, other: Union[Real, np.ndarray]) -> 'Vector2DArray':
+        return self * other
+
+    def __truediv__(self, other: Union[Real, np.ndarray]) -> 'Vector2DArray':
+        if not isinstance(other, (Real, np.ndarray)):
+            return NotImplemented
+
+        return self * (1 / other)
+
+    def __iadd__(self, other: Union[Real, Vector2D, 'Vector2DArray']) -> 'Vector2DArray':
+        components = self._components(other)
+        if components is None:
+            return NotImplemented
+
+        self._abscissa += components[0]
+        self._ordinate += components[1]
+
+        return self
+
+    def __imul__(self, other: Union[Real, np.ndarray]) -> 'Vector2DArray':
+        if not isinstance(other, (Real, np.ndarray)):
+            return NotImplemented
+
+        self._abscissa *= other
+        self._ordinate *= other
+
+        return self
+
+    def __abs__(self) -> np.ndarray:
+        return np.hypot(self._abscissa, self._ordinate)
+
+    def __matmul__(self, other: Union[Vector2D, 'Vector2DArray']) -> np.ndarray:
+        if not isinstance(other, (Vector2D, Vector2DArray)):
+            return NotImplemented
+
+        return self._abscissa * other.abscissa + self._ordinate * other.ordinate
+
+    def get_angle(self, other: Union[Vector2D, 'Vector2DArray']) -> np.ndarray:
+        if not isinstance(other, (Vector2D, Vector2DArray)):
+            raise ValueError
+
+        norms = abs(self) * abs(other)
+        if np.any(norms == 0):
+            raise ValueError("It is impossible to calculate the angle for the zero vector")
+
+        return np.degrees(np.arccos(np.clip((self @ other) / norms, -1, 1)))
+
+    def conjugate(self) -> 'Vector2DArray':
+        return Vector2DArray.from_arrays(self._abscissa.copy(), -self._ordinate)
+
+
+Vectors2D = Union[np.ndarray, Vector2DArray]  # (N, 2) array or packed vectors
+
+
+def _split(vectors: Vectors2D) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(vectors, Vector2DArray):
+        return vectors.abscissa, vectors.ordinate
+
+    vectors = np.asarray(vectors)
+    if vectors.ndim != 2 or vectors.shape[1] != 2:
+        raise ValueError("vectors must be an (N, 2) array or Vector2DArray")
+
+    return vectors[:, 0], vectors[:, 1]
+
+
+def get_norms(vectors: Vectors2D) -> np.ndarray:
+    return np.hypot(*_split(vectors))
+
+
+def get_dots(lhs: Vectors2D, rhs: Vectors2D) -> np.ndarray:
+    (x1, y1), (x2, y2) = _split(lhs), _split(rhs)
+
+    return x1 * x2 + y1 * y2
+
+
+def get_crosses(lhs: Vectors2D, rhs: Vectors2D) -> np.ndarray:
+    (x1, y1), (x2, y2) = _split(lhs), _split(rhs)
+
+    return x1 * y2 - y1 * x2
+
+
+def get_angles(lhs: Vectors2D, rhs: Vectors2D) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Angles between vector pairs in degrees, as Vector2D.get_angle, in one pass.
+
+    Returns the angles and a validity mask; pairs with a zero vector are
+    marked False and get nan instead of raising ValueError.
+    """
+    (x1, y1), (x2, y2) = _split(lhs), _split(rhs)
+
+    valid = ((x1 != 0) | (y1 != 0)) & ((x2 != 0) | (y2 != 0))
+    # atan2(|cross|, dot) needs no norms and stays accurate near 0 and 180 degrees
+    angles = np.degrees(np.arctan2(np.abs(x1 * y2 - y1 * x2), x1 * x2 + y1 * y2))
+    angles[~valid] = np.nan
+
+    return angles, valid
+
+
+def rotate(vectors: Vectors2D, angle: Union[Real, np.ndarray]) -> Vectors2D:
+    """Rotate counterclockwise by angle in degrees (one angle or one per vector)."""
+    x, y = _split(vectors)
+    radians = np.radians(angle)
+    cos, sin = np.cos(radians), np.sin(radians)
+
+    abscissa, ordinate = x * cos - y * sin, x * sin + y * cos
+
+    if isinstance(vectors, Vector2DArray):
+        return Vector2DArray.from_arrays(abscissa, ordinate)
+
+    return np.stack((abscissa, ordinate), axis=1)
+
+
+def to_complex(vectors: np.ndarray) -> np.ndarray:
+    """View a C-contiguous (N, 2) float64 array as N complex numbers without copying."""
+    if vectors.ndim != 2 or vectors.shape[1] != 2:
+        raise ValueError("vectors must be an (N, 2) array")
+
+    return np.ascontiguousarray(vectors, dtype=np.float64).view(np.complex128).reshape(-1)
+
+
+def from_complex(numbers: np.ndarray) -> np.ndarray:
+    """View complex128 numbers as an (N, 2) float64 array without copying, as Vector2D.__complex__ inverted."""
+    return np.ascontiguousarray(numbers, dtype=np.complex128).view(np.float64).reshape(-1, 2)
@@ -1,13 +1,17 @@
 from numbers import Real
-from typing import Any, Iterable, Iterator, Union
+from typing import Any, Iterable, Iterator, Optional, Union
 from itertools import zip_longest
 
+import numpy as np
+
 
 class VectorND:
     _vec: list  # list of vector components
+    _norm: Optional[float]  # cached abs(self), the components never change
 
     def __init__(self, iterable: Iterable[Real]):
         self._vec = list(iterable)
+        self._norm = None
 
         if any(not isinstance(elem, Real) for elem in iterable):
             raise TypeError("Components of vector must be Real numbers")
@@ -46,7 +50,10 @@ class VectorND:
         raise IndexError
 
     def __abs__(self) -> float:
-        return sum(x ** 2 for x in self._vec) ** (1 / 2)
+        if self._norm is None:
+            self._norm = sum(x ** 2 for x in self._vec) ** (1 / 2)
+
+        return self._norm
 
     def __float__(self) -> float:
         return float(abs(self))
@@ -61,23 +68,23 @@ class VectorND:
         if not isinstance(other, VectorND):
             raise TypeError
 
-        c = list(zip_longest(self._vec, other._vec, fillvalue=0))
-
-        return all(x[0] == x[1] for x in c)
+        return all(x == y for x, y in zip_longest(self._vec, other._vec, fillvalue=0))
 
     def __lt__(self, other: 'VectorND') -> bool:
         if not isinstance(other, VectorND):
             raise TypeError
 
-        c = list(zip_longest(self._vec, other._vec, fillvalue=0))
+        prefix_equal = True
 
-        for i in range(len(c)):
-            if c[i][0] < c[i][1] and all(c[j][0] == c[j][1] for j in range(i)):
+        for x, y in zip_longest(self._vec, other._vec, fillvalue=0):
+            if x < y and prefix_equal:
                 return True
 
-            elif c[i][0] > c[i][1]:
+            elif x > y:
                 return False
 
+            prefix_equal = prefix_equal and x == y
+
         return False
 
     def __le__(self, other: 'VectorND') -> bool:
@@ -86,6 +93,13 @@ class VectorND:
 
         return self < other or self == other
 
+    def sort_key(self, dimension: int = 0) -> tuple:
+        """
+        Components zero-filled up to dimension: for vectors not longer than dimension
+        the keys compare exactly as the vectors do with <.
+        """
+        return tuple(self._vec) + (0,) * (dimension - len(self._vec))
+
     def __mul__(self, num: Real) -> 'VectorND':
         if not isinstance(num, Real):
             raise TypeError
@@ -134,3 +148,268 @@ class VectorND:
             raise TypeError
 
         return sum(x[0] * x[1] for x in zip_longest(self._vec, other._vec, fillvalue=0))
+
+
+def sort_vectors(vectors: Iterable[VectorND], reverse: bool = False) -> list[VectorND]:
+    vectors = list(vectors)
+    dimension = max((len(vector) for vector in vectors), default=0)
+
+    return sorted(vectors, key=lambda vector: vector.sort_key(dimension), reverse=reverse)
+
+
+def _aligned(lhs: np.ndarray, rhs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # zero-fill the shorter vector, as zip_longest(..., fillvalue=0) does
+    if len(lhs) < len(rhs):
+        lhs = np.concatenate((lhs, np.zeros(len(rhs) - len(lhs))))
+    elif len(rhs) < len(lhs):
+        rhs = np.concatenate((rhs, np.zeros(len(lhs) - len(rhs))))
+
+    return lhs, rhs
+
+
+class ArrayVectorND(VectorND):
+    """
+    VectorND backed by one contiguous float64 array.
+
+    The components are shared without copying through np.asarray(v) and
+    v.buffer on every supported Python; memoryview(v) needs Python 3.12+,
+    where classes can export buffers through __buffer__.
+    """
+
+    _vec: np.ndarray  # contiguous float64 buffer of vector components
+
+    def __init__(self, iterable: Iterable[Real]):
+        components = iterable if isinstance(iterable, np.ndarray) else np.asarray(list(iterable))
+
+        if components.dtype.kind not in "biuf" or components.ndim != 1:
+            raise TypeError("Components of vector must be Real numbers")
+
+        if len(components) == 0:
+            raise ValueError("A vector cannot be created "
+                             "based on an empty iterable object")
+
+        self._vec = np.ascontiguousarray(components, dtype=np.float64)
+
+    @classmethod
+    def from_buffer(cls, buffer: Any) -> 'ArrayVectorND':
+        """Wrap a float64 buffer without copying: both sides see later changes."""
+        vector = cls.__new__(cls)
+        vector._vec = np.frombuffer(buffer, dtype=np.float64)
+
+        if len(vector._vec) == 0:
+            raise ValueError("A vector cannot be created "
+                             "based on an empty iterable object")
+
+        return vector
+
+    def __buffer__(self, flags: int) -> memoryview:
+        # PEP 688: only called on Python 3.12+, older versions raise TypeError in memoryview(v)
+        return memoryview(self._vec)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return np.array(self._vec, dtype=dtype)
+
+        return self._vec if dtype is None else self._vec.astype(dtype, copy=False)
+
+    @property
+    def buffer(self) -> memoryview:
+        """Writable view of the components, the zero-copy path that also works before Python 3.12."""
+        return memoryview(self._vec)
+
+    @staticmethod
+    def _components(other: VectorND) -> np.ndarray:
+        return other._vec if isinstance(other, ArrayVectorND) else np.asarray(other._vec, dtype=np.float64)
+
+    def __abs__(self) -> float:
+        return float(np.sqrt(self._vec @ self._vec))
+
+    def __eq__(self, other: 'VectorND') -> bool:
+        if not isinstance(other, VectorND):
+            raise TypeError
+
+        lhs, rhs = _aligned(self._vec, self._components(other))
+
+        return bool(np.array_equal(lhs, rhs))
+
+    def __lt__(self, other: 'VectorND') -> bool:
+        if not isinstance(other, VectorND):
+            raise TypeError
+
+        lhs, rhs = _aligned(self._vec, self._components(other))
+        different = np.flatnonzero(lhs != rhs)
+
+        return bool(len(different) > 0 and lhs[different[0]] < rhs[different[0]])
+
+    def __mul__(self, num: Real) -> 'ArrayVectorND':
+        if not isinstance(num, Real):
+            raise TypeError
+
+        return ArrayVectorND(self._vec * num)
+
+    def __neg__(self) -> 'ArrayVectorND':
+        return ArrayVectorND(-self._vec)
+
+    def __add__(self, other: Union['VectorND', Real]) -> 'ArrayVectorND':
+        if isinstance(other, Real):
+            return ArrayVectorND(self._vec + other)
+        if isinstance(other, VectorND):
+            return ArrayVectorND(np.add(*_aligned(self._vec, self._components(other))))
+
+        raise TypeError
+
+    def __sub__(self, other: Union['VectorND', Real]) -> 'ArrayVectorND':
+        if isinstance(other, Real):
+            return ArrayVectorND(self._vec - other)
+        if isinstance(other, VectorND):
+            return ArrayVectorND(np.subtract(*_aligned(self._vec, self._components(other))))
+
+        raise TypeError
+
+    def __matmul__(self, other: 'VectorND') -> float:
+        if not isinstance(other, VectorND):
+            raise TypeError
+
+        other_vec = self._components(other)
+        length = min(len(self._vec), len(other_vec))
+
+        return float(self._vec[:length] @ other_vec[:length])
+
+
+class VectorNDArray:
+    """
+    Many vectors in one 2-D float64 buffer: row i holds vector i,
+    zero-filled up to the longest vector, as zip_longest(..., fillvalue=0) does.
+    """
+
+    _data: np.ndarray  # (number of vectors, dimension)
+    _lengths: np.ndarray  # own length of every vector
+    _squared_norms: Optional[np.ndarray]
+
+    def __init__(self, vectors: Iterable[Union[VectorND, Iterable[Real]]]):
+        rows = [np.asarray(ArrayVectorND._components(vector) if isinstance(vector, VectorND)
+                           else ArrayVectorND(vector)._vec) for vector in vectors]
+
+        if len(rows) == 0:
+            raise ValueError("A vector array cannot be created "
+                             "based on an empty iterable object")
+
+        self._lengths = np.array([len(row) for row in rows])
+        self._data = np.zeros((len(rows), self._lengths.max()))
+        for i, row in enumerate(rows):
+            self._data[i, :len(row)] = row
+
+        self._squared_norms = None
+
+    @classmethod
+    def from_array(cls, data: np.ndarray) -> 'VectorNDArray':
+        """Wrap a 2-D float64 array without copying; every row is a full-length vector."""
+        if data.ndim != 2 or data.shape[0] == 0 or data.shape[1] == 0:
+            raise ValueError("A vector array must be built from a non-empty 2-D array")
+
+        vectors = cls.__new__(cls)
+        vectors._data = np.asarray(data, dtype=np.float64)
+        vectors._lengths = np.full(data.shape[0], data.shape[1])
+        vectors._squared_norms = None
+
+        return vectors
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __getitem__(self, i: int) -> ArrayVectorND:
+        return ArrayVectorND(self._data[i, :self._lengths[i]])
+
+    def __iter__(self) -> Iterator[ArrayVectorND]:
+        return (self[i] for i in range(len(self)))
+
+    def precompute_norms(self) -> None:
+        """Cache squared norms for norms() and nearest(); call again after changing data in place."""
+        self._squared_norms = np.einsum("ij,ij->i", self._data, self._data)
+
+    def _get_squared_norms(self) -> np.ndarray:
+        if self._squared_norms is not None:
+            return self._squared_norms
+
+        return np.einsum("ij,ij->i", self._data, self._data)
+
+    def norms(self) -> np.ndarray:
+        return np.sqrt(self._get_squared_norms())
+
+    def _padded(self, other: Union[VectorND, 'VectorNDArray']) -> tuple[np.ndarray, np.ndarray]:
+        other_data = other._data if isinstance(other, VectorNDArray) else ArrayVectorND._components(other)
+        dimension = max(self._data.shape[1], other_data.shape[-1])
+
+        def pad(data: np.ndarray) -> np.ndarray:
+            if data.shape[-1] == dimension:
+                return data
+
+            padding = [(0, 0)] * (data.ndim - 1) + [(0, dimension - data.shape[-1])]
+            return np.pad(data, padding)
+
+        return pad(self._data), pad(other_data)
+
+    def dot(self, other: Union[VectorND, 'VectorNDArray']) -> np.ndarray:
+        """Dot product of every vector with one vector, or row by row with an array of the same size."""
+        if not isinstance(other, (VectorND, VectorNDArray)):
+            raise TypeError
+
+        lhs, rhs = self._padded(other)
+
+        if rhs.ndim == 1:
+            return lhs @ rhs
+
+        if lhs.shape[0] != rhs.shape[0]:
+            raise ValueError("Arrays of vectors must have the same number of vectors")
+
+        return np.einsum("ij,ij->i", lhs, rhs)
+
+    def __matmul__(self, other: Union[VectorND, 'VectorNDArray']) -> np.ndarray:
+        if not isinstance(other, (VectorND, VectorNDArray)):
+            raise TypeError
+
+        lhs, rhs = self._padded(other)
+
+        return lhs @ rhs.T
+
+    def argsort(self) -> np.ndarray:
+        """Indices that sort the vectors lexicographically, consistent with VectorND.__lt__."""
+        # np.lexsort uses the last key as the primary one
+        return np.lexsort(self._data.T[::-1])
+
+    def sorted(self) -> 'VectorNDArray':
+        order = self.argsort()
+
+        vectors = VectorNDArray.__new__(VectorNDArray)
+        vectors._data = self._data[order]
+        vectors._lengths = self._lengths[order]
+        vectors._squared_norms = None if self._squared_norms is None else self._squared_norms[order]
+
+        return vectors
+
+    def nearest(self, query: VectorND, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k nearest vectors to query by Euclidean distance.
+
+        Returns indices and distances, closest first.
+        """
+        if not isinstance(query, VectorND):
+            raise TypeError
+
+        if k < 1:
+            raise ValueError("k must be natural number")
+
+        data, query_vec = self._padded(query)
+        k = min(k, len(self))
+
+        squared = self._get_squared_norms() - 2 * (data @ query_vec) + query_vec @ query_vec
+        np.maximum(squared, 0, out=squared)
+
+        candidates = np.argpartition(squared, k - 1)[:k]
+        order = candidates[np.argsort(squared[candidates], kind="stable")]
+
+        return order, np.sqrt(squared[order])
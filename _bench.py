@@ -0,0 +1,46 @@
+"""
+Helpers shared by the bench_*.py scripts.
+
+Every script prints its results and appends them to bench_output.txt
+next to this file, so runs on different machines can be collected.
+"""
+import os
+import platform
+import time
+from datetime import datetime
+from typing import Callable
+
+_OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_output.txt")
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    """The best of repeat wall-clock runs of func, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+class Report:
+    """Collects the lines of one benchmark run and writes them out on exit."""
+
+    _lines: list[str]
+
+    def __init__(self, title: str) -> None:
+        self._lines = []
+        self.line(f"== {title} | {datetime.now():%Y-%m-%d %H:%M} | {platform.python_implementation()} "
+                  f"{platform.python_version()} | {os.cpu_count()} cpus")
+
+    def __enter__(self) -> 'Report':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        with open(_OUTPUT_PATH, "a", encoding="utf-8") as file:
+            file.write("\n".join(self._lines) + "\n\n")
+
+    def line(self, text: str) -> None:
+        print(text, flush=True)
+        self._lines.append(text)
@@ -1,3 +1,6 @@
+from enum import StrEnum
+from typing import Iterable, Iterator, Union
+
 import numpy as np
 
 
@@ -5,14 +8,204 @@ class ShapeMismatchError(BaseException):
     pass
 
 
-def adaptive_filter(
+# a low-rank update whose small system is worse conditioned than this
+# falls back to a full refactorization: its rounding error would dominate
+_UPDATE_CONDITION_LIMIT = 1e8
+
+
+class Solvers(StrEnum):
+    INVERSE = "inverse"
+    SOLVE = "solve"
+
+
+def _solve_filter(
         Vs: np.ndarray,
         Vj: np.ndarray,
         diag_A: np.ndarray
 ) -> np.ndarray:
+    # scaling the columns replaces the product with np.diag(diag_A),
+    # and solve avoids forming the inverse explicitly
+    Vj_H = np.conj(np.swapaxes(Vj, -1, -2))
+    s = (Vj_H @ Vj) * diag_A[..., np.newaxis, :]
+    return Vs - Vj @ np.linalg.solve(np.eye(s.shape[-1]) + s, Vj_H @ Vs)
+
+
+def adaptive_filter(
+        Vs: np.ndarray,
+        Vj: np.ndarray,
+        diag_A: np.ndarray,
+        solver: Union[str, Solvers] = Solvers.INVERSE,
+) -> np.ndarray:
+    solver = Solvers(solver)
+
     if Vs.shape[0] != Vj.shape[0] or Vj.shape[1] != diag_A.shape[0] or diag_A.ndim != 1:
         raise ShapeMismatchError()
 
+    if solver == Solvers.SOLVE:
+        return _solve_filter(Vs, Vj, diag_A)
+
     Vj_H = np.conj(Vj).T
     s = Vj_H @ Vj @ np.diag(diag_A)
     return Vs - Vj @ np.linalg.inv(np.eye(s.shape[0]) + s) @ (Vj_H @ Vs)
+
+
+def adaptive_filter_batch(
+        Vs: np.ndarray,
+        Vj: np.ndarray,
+        diag_A: np.ndarray
+) -> np.ndarray:
+    if Vs.ndim != 3 or Vj.ndim != 3 or diag_A.ndim != 2:
+        raise ShapeMismatchError()
+
+    if not (Vs.shape[0] == Vj.shape[0] == diag_A.shape[0]):
+        raise ShapeMismatchError()
+
+    if Vs.shape[1] != Vj.shape[1] or Vj.shape[2] != diag_A.shape[1]:
+        raise ShapeMismatchError()
+
+    return _solve_filter(Vs, Vj, diag_A)
+
+
+class AdaptiveFilter:
+    _Vj: np.ndarray
+    _Vj_H: np.ndarray
+    _diag_A: np.ndarray
+    _gram: np.ndarray  # Vj^H @ Vj
+    _inv: np.ndarray  # (I + Vj^H @ Vj @ diag(diag_A))^-1
+    _updates: int  # low-rank updates applied since the last factorization
+    refactorize_every: int
+
+    def __init__(self, Vj: np.ndarray, diag_A: np.ndarray, refactorize_every: int = 64) -> None:
+        if refactorize_every < 1:
+            raise ValueError
+
+        self.refactorize_every = refactorize_every
+        self._factorize(Vj, diag_A)
+
+    @property
+    def Vj(self) -> np.ndarray:
+        return self._Vj
+
+    @Vj.setter
+    def Vj(self, Vj_new: np.ndarray) -> None:
+        self._factorize(Vj_new, self._diag_A)
+
+    @property
+    def diag_A(self) -> np.ndarray:
+        return self._diag_A
+
+    @diag_A.setter
+    def diag_A(self, diag_A_new: np.ndarray) -> None:
+        self._factorize(self._Vj, diag_A_new)
+
+    def _factorize(self, Vj: np.ndarray, diag_A: np.ndarray) -> None:
+        if Vj.ndim != 2 or diag_A.ndim != 1 or Vj.shape[1] != diag_A.shape[0]:
+            raise ShapeMismatchError()
+
+        # private read-only copies: the cache can only change through this class
+        self._Vj = np.array(Vj)
+        self._diag_A = np.array(diag_A)
+        self._Vj.flags.writeable = False
+        self._diag_A.flags.writeable = False
+
+        self._Vj_H = np.conj(self._Vj).T
+        self._gram = self._Vj_H @ self._Vj
+        self._inv = np.linalg.inv(np.eye(self._gram.shape[0]) + self._gram * self._diag_A)
+        self._updates = 0
+
+    def _needs_factorization(self) -> bool:
+        # updates accumulate rounding error, so the inverse is rebuilt every so often
+        return self._updates + 1 >= self.refactorize_every
+
+    def apply(self, Vs: np.ndarray) -> np.ndarray:
+        if Vs.shape[0] != self._Vj.shape[0]:
+            raise ShapeMismatchError()
+
+        return Vs - self._Vj @ (self._inv @ (self._Vj_H @ Vs))
+
+    def apply_stream(self, blocks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        for Vs in blocks:
+            yield self.apply(Vs)
+
+    def update_jammer(self, index: int, column: np.ndarray) -> None:
+        if column.shape != (self._Vj.shape[0],):
+            raise ShapeMismatchError()
+
+        if not 0 <= index < self._Vj.shape[1]:
+            raise IndexError
+
+        dtype = np.result_type(self._Vj, column)
+
+        if self._needs_factorization():
+            Vj = self._Vj.astype(dtype)
+            Vj[:, index] = column
+            self._factorize(Vj, self._diag_A)
+            return
+
+        # the gram matrix changes in row and column index only:
+        # delta = b e^T + e r^T, which makes the update of (I + G D) rank two
+        b = self._Vj_H @ column
+        b[index] = np.vdot(column, column)
+        b -= self._gram[:, index]
+        r = np.conj(b)
+        r[index] = 0
+
+        e = np.zeros(self._diag_A.shape[0])
+        e[index] = 1
+
+        U = np.stack((b, e), axis=1)
+        V = np.stack((self._diag_A[index] * e, r * self._diag_A))
+        inv_U = self._inv @ U
+        capacitance = np.eye(2) + V @ inv_U
+
+        if np.linalg.cond(capacitance) > _UPDATE_CONDITION_LIMIT:
+            Vj = self._Vj.astype(dtype)
+            Vj[:, index] = column
+            self._factorize(Vj, self._diag_A)
+            return
+
+        self._inv = self._inv - inv_U @ np.linalg.solve(capacitance, V @ self._inv)
+        self._updates += 1
+
+        # only column index of Vj, row index of Vj^H and the cross of the gram matrix
+        # are written, so an update costs O(N M + M^2) instead of rebuilding the products
+        if dtype != self._Vj.dtype:
+            self._Vj = self._Vj.astype(dtype)
+            self._Vj_H = self._Vj_H.astype(dtype)
+            self._gram = self._gram.astype(dtype)
+        else:
+            self._Vj.flags.writeable = True
+
+        self._Vj[:, index] = column
+        self._Vj_H[index] = np.conj(column)
+        self._Vj.flags.writeable = False
+
+        self._gram[:, index] += b
+        self._gram[index] = np.conj(self._gram[:, index])
+
+    def update_gain(self, index: int, value: float) -> None:
+        if not 0 <= index < self._diag_A.shape[0]:
+            raise IndexError
+
+        diag_A = self._diag_A.astype(np.result_type(self._diag_A, value))
+        delta = value - diag_A[index]
+        diag_A[index] = value
+
+        if self._needs_factorization():
+            self._factorize(self._Vj, diag_A)
+            return
+
+        # rank-one change of column index: Sherman-Morrison
+        inv_g = self._inv @ self._gram[:, index]
+        correction = delta * inv_g[index]
+        denominator = 1 + correction
+
+        if abs(denominator) * _UPDATE_CONDITION_LIMIT <= 1 + abs(correction):
+            self._factorize(self._Vj, diag_A)
+            return
+
+        self._inv = self._inv - np.outer(inv_g, self._inv[index]) * delta / denominator
+        self._updates += 1
+
+        self._diag_A = diag_A
+        self._diag_A.flags.writeable = False
@@ -0,0 +1,48 @@
+"""
+Naive against separable blur_image engines over image and kernel sizes.
+
+    python bench_blur_image.py
+"""
+import numpy as np
+
+from _bench import Report, best_time
+from blur_image import BlurEngines, blur_image
+
+IMAGE_SIZES = (64, 128, 256)
+KERNEL_SIZES = (3, 11, 31)
+CHANNELS = (None, 3)  # grayscale and RGB
+DTYPES = (np.uint8, np.float64)  # separable is exact for the first, rounds for the second
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+
+    with Report("blur_image engines") as report:
+        report.line(f"{'image':>14} {'dtype':>8} {'kernel':>6} {'naive, s':>10} {'separable, s':>13} "
+                    f"{'speedup':>8} {'max |diff|':>11}")
+
+        for size in IMAGE_SIZES:
+            for channels in CHANNELS:
+                for dtype in DTYPES:
+                    shape = (size, size) if channels is None else (size, size, channels)
+                    image = (rng.random(shape) * 255).astype(dtype)
+
+                    for kernel_size in KERNEL_SIZES:
+                        _compare(report, image, kernel_size)
+
+
+def _compare(report: Report, image: np.ndarray, kernel_size: int) -> None:
+    naive = blur_image(image, kernel_size, BlurEngines.NAIVE)
+    separable = blur_image(image, kernel_size, BlurEngines.SEPARABLE)
+    difference = np.abs(naive.astype(np.float64) - separable).max()
+
+    naive_time = best_time(lambda: blur_image(image, kernel_size, BlurEngines.NAIVE), repeat=1)
+    separable_time = best_time(lambda: blur_image(image, kernel_size, BlurEngines.SEPARABLE))
+
+    report.line(f"{'x'.join(map(str, image.shape)):>14} {image.dtype.name:>8} {kernel_size:>6} "
+                f"{naive_time:>10.3f} {separable_time:>13.4f} {naive_time / separable_time:>7.0f}x "
+                f"{difference:>11.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Scaling of blur_image_parallel (one large image in row bands) and
+blur_images (a stack of images) from 1 worker to every core, for the
+thread and process backends.
+
+    python bench_blur_parallel.py [max_workers]
+"""
+import os
+import sys
+
+import numpy as np
+
+from _bench import Report, best_time
+from blur_image import BlurEngines, ParallelBackends, blur_image, blur_image_parallel, blur_images
+
+IMAGE_SHAPE = (2160, 3840, 3)  # one 4K frame
+STACK_SHAPE = (32, 540, 960, 3)  # 32 quarter-HD frames
+KERNEL_SIZE = 31
+BAND_HEIGHT = 256
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    return counts
+
+
+def main() -> None:
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=IMAGE_SHAPE, dtype=np.uint8)
+    images = rng.integers(0, 256, size=STACK_SHAPE, dtype=np.uint8)
+
+    with Report("blur_image parallel scaling") as report:
+        serial_image = best_time(lambda: blur_image(image, KERNEL_SIZE, BlurEngines.SEPARABLE))
+        serial_stack = best_time(lambda: [blur_image(x, KERNEL_SIZE, BlurEngines.SEPARABLE) for x in images])
+        report.line(f"serial separable: image {serial_image:.3f} s, stack {serial_stack:.3f} s")
+        report.line(f"{'backend':>8} {'workers':>7} {'image, s':>9} {'speedup':>8} {'stack, s':>9} {'speedup':>8}")
+
+        for backend in ParallelBackends:
+            for workers in _worker_counts(max_workers):
+                image_time = best_time(lambda: blur_image_parallel(
+                    image, KERNEL_SIZE, workers=workers, backend=backend, band_height=BAND_HEIGHT
+                ))
+                stack_time = best_time(lambda: blur_images(images, KERNEL_SIZE, workers=workers, backend=backend))
+
+                report.line(f"{backend:>8} {workers:>7} {image_time:>9.3f} {serial_image / image_time:>7.2f}x "
+                            f"{stack_time:>9.3f} {serial_stack / stack_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
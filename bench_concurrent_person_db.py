@@ -0,0 +1,75 @@
+"""
+ConcurrentPersonDB under 1 to 32 threads against PersonDB behind one global
+lock, for a read-heavy and a write-heavy mix of operations.
+
+    python bench_concurrent_person_db.py [max_threads]
+"""
+import random
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+from _bench import Report
+from CRUD import ConcurrentPersonDB, Person, PersonDB
+
+USERS = 100_000
+OPERATIONS = 200_000  # in total, split between the threads
+READ_SHARES = (0.9, 0.5)  # the rest are password updates
+
+
+def _run(database: PersonDB, ids: list, threads_number: int, read_share: float, lock) -> float:
+    barrier = threading.Barrier(threads_number + 1)
+    per_thread = OPERATIONS // threads_number
+
+    def work(seed: int) -> None:
+        rng = random.Random(seed)
+        choices = [(rng.random() < read_share, rng.choice(ids)) for _ in range(per_thread)]
+        update = Person(login="", password="Upd4tedPassword", username="")
+        barrier.wait()
+
+        for read, person_id in choices:
+            with lock:
+                if read:
+                    database.read_person_info(person_id)
+                else:
+                    database.update_person_info(person_id, update)
+
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(threads_number)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+
+    return per_thread * threads_number / (time.perf_counter() - start)
+
+
+def main() -> None:
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    persons = [Person(login=f"user{i}", password=f"Passw0rd{i:09d}", username=f"Name{i % 1000}")
+               for i in range(USERS)]
+
+    global_db = PersonDB()
+    global_ids = global_db.create_many(persons)
+    concurrent_db = ConcurrentPersonDB()
+    concurrent_ids = concurrent_db.create_many(
+        [Person(person.login, person.password, person.username) for person in persons])
+
+    with Report("ConcurrentPersonDB contention") as report:
+        report.line(f"{'reads':>6} {'threads':>7} {'global lock ops/s':>18} {'striped ops/s':>14}")
+
+        for read_share in READ_SHARES:
+            threads_number = 1
+            while threads_number <= max_threads:
+                global_rate = _run(global_db, global_ids, threads_number, read_share, threading.Lock())
+                striped_rate = _run(concurrent_db, concurrent_ids, threads_number, read_share, nullcontext())
+
+                report.line(f"{read_share:>6.0%} {threads_number:>7} {global_rate:>18,.0f} {striped_rate:>14,.0f}")
+                threads_number *= 2
+
+
+if __name__ == "__main__":
+    main()
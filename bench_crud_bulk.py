@@ -0,0 +1,63 @@
+"""
+PersonDB.create_many against a create_person loop, and the batch validation
+of create_many against checking every row on its own.
+
+    python bench_crud_bulk.py [rows ...]
+"""
+import sys
+
+from _bench import Report, best_time
+from CRUD import Person, PersonDB
+
+ROWS = (10_000, 200_000)
+
+
+def _persons(rows: int) -> list[Person]:
+    return [Person(login=f"user{i}", password=f"Passw0rd{i:09d}", username=f"Name{i % 1000}") for i in range(rows)]
+
+
+def _create_loop(persons: list[Person]) -> None:
+    database = PersonDB()
+    for person in persons:
+        database.create_person(person)
+
+
+def _validate_rows(database: PersonDB, persons: list[Person]) -> bool:
+    # what create_many checked before the batch validation
+    batch_logins = set()
+    correct = True
+    for person in persons:
+        if person.login in batch_logins or not (
+                database._check_login(person.login) and database._check_password(person.password)):
+            correct = False
+        batch_logins.add(person.login)
+
+    return correct
+
+
+def main() -> None:
+    rows_numbers = [int(arg) for arg in sys.argv[1:]] or ROWS
+
+    with Report("PersonDB bulk create") as report:
+        report.line(f"{'rows':>9} {'loop, s':>8} {'many, s':>8} {'speedup':>8} "
+                    f"{'rows check, s':>14} {'batch check, s':>15} {'speedup':>8}")
+
+        for rows in rows_numbers:
+            persons = _persons(rows)
+            database = PersonDB()
+            logins = [person.login for person in persons]
+            passwords = [person.password for person in persons]
+
+            loop_time = best_time(lambda: _create_loop(persons))
+            many_time = best_time(lambda: PersonDB().create_many(persons))
+
+            rows_check_time = best_time(lambda: _validate_rows(database, persons))
+            batch_check_time = best_time(lambda: database._is_batch_correct(logins, passwords))
+
+            report.line(f"{rows:>9,} {loop_time:>8.3f} {many_time:>8.3f} {loop_time / many_time:>7.1f}x "
+                        f"{rows_check_time:>14.3f} {batch_check_time:>15.3f} "
+                        f"{rows_check_time / batch_check_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
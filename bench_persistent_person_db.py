@@ -0,0 +1,80 @@
+"""
+PersistentPersonDB write throughput for different sync_every, and cold start
+from a snapshot against replaying the same records from the log.
+
+    python bench_persistent_person_db.py [directory]
+
+The directory should be on the disk being measured; a temporary one is used
+by default.
+"""
+import sys
+import tempfile
+import time
+
+from _bench import Report
+from CRUD import Person, PersistentPersonDB
+
+WRITES = 20_000
+SYNC_EVERY = (1, 16, 64, 1024)
+BATCH_SIZE = 1000
+RECORDS = (100_000, 1_000_000)
+
+
+def _persons(start: int, number: int) -> list[Person]:
+    return [Person(login=f"user{i}", password=f"Passw0rd{i:09d}", username=f"Name{i % 1000}")
+            for i in range(start, start + number)]
+
+
+def _write_throughput(report: Report, root: str) -> None:
+    report.line(f"{'sync_every':>10} {'create/s':>10} {'create_many rows/s':>19}")
+    persons = _persons(0, WRITES)
+
+    for sync_every in SYNC_EVERY:
+        with tempfile.TemporaryDirectory(dir=root) as path, PersistentPersonDB(path, sync_every) as database:
+            start = time.perf_counter()
+            for person in persons:
+                database.create_person(person)
+            database.sync()
+            create_rate = WRITES / (time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory(dir=root) as path, PersistentPersonDB(path, sync_every) as database:
+            start = time.perf_counter()
+            for first in range(0, WRITES, BATCH_SIZE):
+                database.create_many(persons[first:(first + BATCH_SIZE)])
+            database.sync()
+            many_rate = WRITES / (time.perf_counter() - start)
+
+        report.line(f"{sync_every:>10} {create_rate:>10,.0f} {many_rate:>19,.0f}")
+
+
+def _cold_start(report: Report, root: str) -> None:
+    report.line(f"{'records':>10} {'from log, s':>12} {'from snapshot, s':>17}")
+
+    for records in RECORDS:
+        with tempfile.TemporaryDirectory(dir=root) as path:
+            with PersistentPersonDB(path, sync_every=1024) as database:
+                for first in range(0, records, BATCH_SIZE):
+                    database.create_many(_persons(first, BATCH_SIZE))
+
+            start = time.perf_counter()
+            with PersistentPersonDB(path) as database:
+                log_time = time.perf_counter() - start
+                database.snapshot()
+
+            start = time.perf_counter()
+            with PersistentPersonDB(path):
+                snapshot_time = time.perf_counter() - start
+
+        report.line(f"{records:>10,} {log_time:>12.3f} {snapshot_time:>17.3f}")
+
+
+def main() -> None:
+    root = sys.argv[1] if len(sys.argv) > 1 else None
+
+    with Report("PersistentPersonDB writes and cold start") as report:
+        _write_throughput(report, root)
+        _cold_start(report, root)
+
+
+if __name__ == "__main__":
+    main()
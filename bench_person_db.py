@@ -0,0 +1,92 @@
+"""
+Memory per record and operations per second of PersonDB at 1M and 10M users.
+
+    python bench_person_db.py [users ...]
+
+Memory is the growth of the peak resident set size while the database is
+filled, divided by the number of users; it includes the Person records, the
+interned strings and the login and username indexes. 10M users need about
+5 GB of RAM.
+"""
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from _bench import Report
+from CRUD import Person, PersonDB
+
+USERS = (1_000_000, 10_000_000)
+OPERATIONS = 100_000
+USERNAMES = 10_000  # distinct names: names repeat, logins and passwords do not
+
+
+def _person(i: int) -> Person:
+    return Person(login=f"user{i}", password=f"Passw0rd{i:09d}", username=f"Name{i % USERNAMES}")
+
+
+def _peak_rss() -> int:
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _rate(operations, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        operations()
+    return count / (time.perf_counter() - start)
+
+
+def _measure(users: int) -> str:
+    rng = random.Random(0)
+    database = PersonDB()
+
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    ids = [database.create_person(_person(i)) for i in range(users)]
+    create_rate = users / (time.perf_counter() - start)
+    bytes_per_user = (_peak_rss() - rss_before) / users
+
+    sample = [rng.randrange(users) for _ in range(OPERATIONS)]
+    reads = iter(sample)
+    logins = iter(sample)
+    usernames = iter(sample)
+    updates = iter(sample)
+    deletes = iter(sample[:OPERATIONS // 2])
+
+    read_rate = _rate(lambda: database.read_person_info(ids[next(reads)]), OPERATIONS)
+    login_rate = _rate(lambda: database.find_by_login(f"user{next(logins)}"), OPERATIONS)
+    username_rate = _rate(lambda: database.find_by_username(f"Name{next(usernames) % USERNAMES}"), OPERATIONS)
+    update_rate = _rate(lambda: database.update_person_info(
+        ids[next(updates)], Person(login="", password="Upd4tedPassword", username="")), OPERATIONS)
+
+    deleted = set()
+
+    def delete() -> None:
+        i = next(deletes)
+        if i not in deleted:
+            deleted.add(i)
+            database.delete_person(ids[i])
+
+    delete_rate = _rate(delete, OPERATIONS // 2)
+
+    return (f"{users:>11,} {bytes_per_user:>9.0f} {create_rate:>10,.0f} {read_rate:>10,.0f} "
+            f"{login_rate:>10,.0f} {username_rate:>10,.0f} {update_rate:>10,.0f} {delete_rate:>10,.0f}")
+
+
+def main() -> None:
+    users_numbers = [int(arg) for arg in sys.argv[1:]] or USERS
+
+    with Report("PersonDB memory and throughput") as report:
+        report.line(f"{'users':>11} {'B/user':>9} {'create/s':>10} {'read/s':>10} {'login/s':>10} "
+                    f"{'username/s':>10} {'update/s':>10} {'delete/s':>10}")
+
+        # peak RSS never goes down, so every size gets a fresh process
+        for users in users_numbers:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                report.line(executor.submit(_measure, users).result())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+ArrayVectorND against the list-backed VectorND over vector dimensions.
+
+    python bench_vector_nd.py
+"""
+import numpy as np
+
+from _bench import Report, best_time
+from VectorND import ArrayVectorND, VectorND
+
+DIMENSIONS = (3, 100, 10_000, 1_000_000)
+
+
+def _abs(vector: VectorND) -> float:
+    vector._norm = None  # VectorND caches the norm; measure the computation itself
+    return abs(vector)
+
+
+OPERATIONS = {
+    "create": lambda lhs, rhs, values: type(lhs)(values),
+    "+": lambda lhs, rhs, values: lhs + rhs,
+    "*": lambda lhs, rhs, values: lhs * 2.5,
+    "@": lambda lhs, rhs, values: lhs @ rhs,
+    "abs": lambda lhs, rhs, values: _abs(lhs),
+    "==": lambda lhs, rhs, values: lhs == rhs,
+    "<": lambda lhs, rhs, values: lhs < rhs,
+}
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+
+    with Report("ArrayVectorND against VectorND") as report:
+        report.line(f"{'dimension':>10} {'operation':>9} {'list, s':>10} {'array, s':>10} {'speedup':>8}")
+
+        for dimension in DIMENSIONS:
+            values = rng.random(dimension).tolist()
+            other = rng.random(dimension).tolist()
+            # equal up to the last component, the worst case for == and <
+            other[:-1] = values[:-1]
+
+            vectors = {
+                VectorND: (VectorND(values), VectorND(other)),
+                ArrayVectorND: (ArrayVectorND(values), ArrayVectorND(other)),
+            }
+            repeat = max(3, 10_000 // dimension)
+
+            for name, operation in OPERATIONS.items():
+                times = {}
+                for cls, (lhs, rhs) in vectors.items():
+                    times[cls] = best_time(lambda: [operation(lhs, rhs, values) for _ in range(repeat)]) / repeat
+
+                report.line(f"{dimension:>10,} {name:>9} {times[VectorND]:>10.2e} {times[ArrayVectorND]:>10.2e} "
+                            f"{times[VectorND] / times[ArrayVectorND]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,197 @@
+import inspect
+import json
+import threading
 import time
-from typing import Callable, TypeVar
+from typing import Callable, Optional, TypeVar
 from functools import wraps
 
 T = TypeVar("T")
 
+_statistics_lock = threading.Lock()
+
 
 def collect_statistic(statistics: dict[str, list[float, int]]) -> Callable[[T], T]:
     def _collect_statistic(func):
         @wraps(func)
         def _wrapper(*args, **kwargs):
-            t1 = time.time()
+            t1 = time.perf_counter()
             res = func(*args, **kwargs)
-            t2 = time.time()
+            t2 = time.perf_counter()
 
             name = func.__name__
-
-            statistics[name] = statistics.get(name, [0, 0])
-
-            new_count = statistics[name][1] + 1
             new_time = t2 - t1
-            new_avg = (statistics[name][0] * statistics[name][1] + new_time) / new_count
 
-            statistics[name] = [new_avg, new_count]
+            with _statistics_lock:
+                avg, count = statistics.get(name, [0, 0])
+                new_count = count + 1
+                statistics[name] = [(avg * count + new_time) / new_count, new_count]
 
             return res
 
         return _wrapper
 
     return _collect_statistic
+
+
+_HISTOGRAM_SIZE = 256  # log-linear buckets: 4 per power of two, 64-bit nanoseconds
+_NO_CALLS = 2 ** 64
+
+
+def _bucket_upper_bound(bucket: int) -> int:
+    if bucket < 8:
+        return bucket
+
+    shift = bucket // 4 - 1
+    return ((bucket % 4 + 5) << shift) - 1
+
+
+class _CallStatistics:
+    __slots__ = ("count", "total", "min", "max", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = _NO_CALLS
+        self.max = 0
+        self.histogram = [0] * _HISTOGRAM_SIZE
+
+    def add(self, duration: int) -> None:
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+
+        if duration < 8:
+            self.histogram[duration] += 1
+        else:
+            shift = duration.bit_length() - 3
+            self.histogram[shift * 4 + (duration >> shift)] += 1
+
+    def merge(self, other: '_CallStatistics') -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram = [x + y for x, y in zip(self.histogram, other.histogram)]
+
+    def percentile(self, q: float) -> int:
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return min(_bucket_upper_bound(bucket), self.max)
+
+        return self.max
+
+
+class Profiler:
+    """
+    Collects count, total, min, max and a latency histogram per wrapped function.
+
+    Every thread writes to its own buffers without locks; snapshot() merges them.
+    While enabled is False a wrapped call costs one attribute check.
+    """
+
+    enabled: bool
+    _local: threading.local
+    _buffers: list[dict[str, _CallStatistics]]
+    _lock: threading.Lock
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._local = threading.local()
+        self._buffers = []
+        self._lock = threading.Lock()
+
+    def _get_buffer(self) -> dict[str, _CallStatistics]:
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = dict()
+            with self._lock:
+                self._buffers.append(buffer)
+
+            return buffer
+
+    def _record(self, name: str, duration: int) -> None:
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._get_buffer()
+
+        try:
+            buffer[name].add(duration)
+        except KeyError:
+            statistics = buffer[name] = _CallStatistics()
+            statistics.add(duration)
+
+    def profile(self, name: Optional[str] = None) -> Callable[[T], T]:
+        def _profile(func):
+            key = func.__name__ if name is None else name
+
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def _async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+
+                    start = time.perf_counter_ns()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        self._record(key, time.perf_counter_ns() - start)
+
+                return _async_wrapper
+
+            @wraps(func)
+            def _wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._record(key, time.perf_counter_ns() - start)
+
+            return _wrapper
+
+        return _profile
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Merged statistics of all threads, times in nanoseconds."""
+        merged = dict()
+
+        with self._lock:
+            buffers = list(self._buffers)
+
+        for buffer in buffers:
+            for name, statistics in list(buffer.items()):
+                merged.setdefault(name, _CallStatistics()).merge(statistics)
+
+        return {
+            name: {
+                "count": statistics.count,
+                "total_ns": statistics.total,
+                "mean_ns": statistics.total / statistics.count,
+                "min_ns": statistics.min,
+                "max_ns": statistics.max,
+                "p50_ns": statistics.percentile(0.5),
+                "p99_ns": statistics.percentile(0.99),
+            }
+            for name, statistics in merged.items()
+        }
+
+    def export(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.clear()
+
+
+global_profiler = Profiler()
@@ -1,3 +1,8 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Union
+
 import numpy as np
 
 
@@ -5,31 +10,237 @@ class ShapeMismatchError(BaseException):
     pass
 
 
+Coords = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _float_dtype(*arrays: np.ndarray) -> np.dtype:
+    dtype = np.result_type(*arrays)
+
+    return dtype if np.issubdtype(dtype, np.inexact) else np.dtype(np.float64)
+
+
+def _prepare_out(out: Optional[Coords], coords: Coords) -> Coords:
+    if out is None:
+        # the inputs may be of any shape, as long as they broadcast
+        shape = np.broadcast_shapes(*(arr.shape for arr in coords))
+        dtype = _float_dtype(*coords)
+
+        return np.empty(shape, dtype=dtype), np.empty(shape, dtype=dtype), np.empty(shape, dtype=dtype)
+
+    # writing into caller buffers is only supported for flat arrays
+    length = len(coords[0])
+    if len(out) != 3 or any(arr.ndim != 1 for arr in coords + tuple(out)):
+        raise ShapeMismatchError()
+
+    if any(len(arr) != length for arr in out):
+        raise ShapeMismatchError()
+
+    return out
+
+
+def _from_sphere(distances, azimuth, inclination, x, y, z) -> None:
+    # the order allows every output to share memory with the input
+    # of the same position: x with distances, y with azimuth, z with inclination
+    rho = np.sin(inclination, out=np.empty_like(x))
+    rho *= distances
+
+    np.cos(inclination, out=z)
+    z *= distances
+
+    np.cos(azimuth, out=x)
+    x *= rho
+
+    np.sin(azimuth, out=y)
+    y *= rho
+
+
+def _to_sphere(abscissa, ordinates, applicates, distances, azimuth, inclination) -> None:
+    # same aliasing rule as _from_sphere
+    squares = np.square(abscissa, out=np.empty_like(distances))
+    buffer = np.square(ordinates, out=np.empty_like(distances))
+    squares += buffer
+    np.square(applicates, out=buffer)
+    squares += buffer
+    np.sqrt(squares, out=squares)
+
+    np.arctan2(ordinates, abscissa, out=azimuth)
+
+    np.divide(applicates, squares, out=inclination)
+    np.arccos(inclination, out=inclination)
+
+    distances[...] = squares
+
+
 def convert_from_sphere(
         distances: np.ndarray,
         azimuth: np.ndarray,
         inclination: np.ndarray,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        out: Optional[Coords] = None,
+) -> Coords:
+    distances, azimuth, inclination = np.asarray(distances), np.asarray(azimuth), np.asarray(inclination)
+
     if not (len(distances) == len(azimuth) == len(inclination)):
         raise ShapeMismatchError()
 
-    x = distances * np.sin(inclination) * np.cos(azimuth)
-    y = distances * np.sin(inclination) * np.sin(azimuth)
-    z = distances * np.cos(inclination)
+    out = _prepare_out(out, (distances, azimuth, inclination))
+    _from_sphere(distances, azimuth, inclination, *out)
 
-    return x, y, z
+    return out
 
 
 def convert_to_sphere(
         abscissa: np.ndarray,
         ordinates: np.ndarray,
         applicates: np.ndarray,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        out: Optional[Coords] = None,
+) -> Coords:
+    abscissa, ordinates, applicates = np.asarray(abscissa), np.asarray(ordinates), np.asarray(applicates)
+
     if not (len(abscissa) == len(ordinates) == len(applicates)):
         raise ShapeMismatchError()
 
-    distances = np.sqrt(abscissa ** 2 + ordinates ** 2 + applicates ** 2)
-    azimuth = np.arctan2(ordinates, abscissa)
-    inclination = np.arccos(applicates / distances)
+    out = _prepare_out(out, (abscissa, ordinates, applicates))
+    _to_sphere(abscissa, ordinates, applicates, *out)
+
+    return out
+
+
+def _split_points(points: np.ndarray) -> Coords:
+    if points.dtype.names is not None:
+        if len(points.dtype.names) != 3 or points.ndim != 1:
+            raise ShapeMismatchError()
+
+        return tuple(points[name] for name in points.dtype.names)
+
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ShapeMismatchError()
+
+    return points[:, 0], points[:, 1], points[:, 2]
+
+
+def _prepare_points_out(out: Optional[np.ndarray], columns: Coords) -> np.ndarray:
+    if out is None:
+        return np.empty((len(columns[0]), 3), dtype=_float_dtype(*columns))
+
+    if out.shape != (len(columns[0]), 3):
+        raise ShapeMismatchError()
+
+    return out
+
+
+def convert_from_sphere_points(
+        points: np.ndarray,
+        out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    columns = _split_points(points)
+    out = _prepare_points_out(out, columns)
+    _from_sphere(*columns, out[:, 0], out[:, 1], out[:, 2])
+
+    return out
+
+
+def convert_to_sphere_points(
+        points: np.ndarray,
+        out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    columns = _split_points(points)
+    out = _prepare_points_out(out, columns)
+    _to_sphere(*columns, out[:, 0], out[:, 1], out[:, 2])
+
+    return out
+
+
+def _iter_chunks(
+        points: Union[np.ndarray, Iterable[np.ndarray]],
+        chunk_size: int,
+) -> Iterator[np.ndarray]:
+    if not isinstance(points, np.ndarray):
+        yield from points
+        return
+
+    for start in range(0, len(points), chunk_size):
+        yield points[start:(start + chunk_size)]
+
+
+def _map_ordered(
+        convert: Callable[[np.ndarray], np.ndarray],
+        chunks: Iterable[np.ndarray],
+        workers: Optional[int],
+) -> Iterator[np.ndarray]:
+    # ufuncs release the GIL, so threads convert chunks in parallel;
+    # the queue bounds how many chunks are held in memory at once
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(convert, np.asarray(chunk)))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def convert_from_sphere_stream(
+        points: Union[np.ndarray, Iterable[np.ndarray]],
+        chunk_size: int = 1 << 20,
+        workers: Optional[int] = None,
+) -> Iterator[np.ndarray]:
+    if chunk_size < 1:
+        raise ValueError
+
+    return _map_ordered(convert_from_sphere_points, _iter_chunks(points, chunk_size), workers)
+
+
+def convert_to_sphere_stream(
+        points: Union[np.ndarray, Iterable[np.ndarray]],
+        chunk_size: int = 1 << 20,
+        workers: Optional[int] = None,
+) -> Iterator[np.ndarray]:
+    if chunk_size < 1:
+        raise ValueError
+
+    return _map_ordered(convert_to_sphere_points, _iter_chunks(points, chunk_size), workers)
+
+
+def _convert_into(
+        convert: Callable[[np.ndarray, Optional[np.ndarray]], np.ndarray],
+        points: np.ndarray,
+        out: np.ndarray,
+        chunk_size: int,
+        workers: Optional[int],
+) -> np.ndarray:
+    if chunk_size < 1:
+        raise ValueError
+
+    if len(points) != len(out):
+        raise ShapeMismatchError()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(convert, points[start:(start + chunk_size)], out[start:(start + chunk_size)])
+            for start in range(0, len(points), chunk_size)
+        ]
+        for future in futures:
+            future.result()
+
+    return out
+
+
+def convert_from_sphere_chunked(
+        points: np.ndarray,
+        out: np.ndarray,
+        chunk_size: int = 1 << 20,
+        workers: Optional[int] = None,
+) -> np.ndarray:
+    return _convert_into(convert_from_sphere_points, points, out, chunk_size, workers)
+
 
-    return distances, azimuth, inclination
+def convert_to_sphere_chunked(
+        points: np.ndarray,
+        out: np.ndarray,
+        chunk_size: int = 1 << 20,
+        workers: Optional[int] = None,
+) -> np.ndarray:
+    return _convert_into(convert_to_sphere_points, points, out, chunk_size, workers)
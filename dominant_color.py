@@ -1,3 +1,6 @@
+from enum import StrEnum
+from typing import Union
+
 import numpy as np
 
 
@@ -5,6 +8,71 @@ class ShapeMismatchError(BaseException):
     pass
 
 
+class ColorModes(StrEnum):
+    PER_CHANNEL = "per_channel"
+    PACKED = "packed"
+
+
+_COLORS_NUMBER = 256
+_RGB_CHANNELS = 3
+
+
+def _color_histograms(images: np.ndarray) -> np.ndarray:
+    # one bincount over the whole stack, each image shifted to its own 256 bins
+    images = images.reshape(images.shape[0], -1)
+    offsets = np.arange(images.shape[0])[:, np.newaxis] * _COLORS_NUMBER
+    histograms = np.bincount((images + offsets).ravel(), minlength=images.shape[0] * _COLORS_NUMBER)
+
+    return histograms.reshape(images.shape[0], _COLORS_NUMBER)
+
+
+def _prefix_sums(histograms: np.ndarray, axis: int) -> np.ndarray:
+    axis %= histograms.ndim
+    shape = list(histograms.shape)
+    shape[axis] += 1
+    cumsum = np.zeros(shape, dtype=histograms.dtype)
+
+    if axis == histograms.ndim - 1:
+        np.cumsum(histograms, axis=-1, out=cumsum[..., 1:])
+        return cumsum
+
+    # np.cumsum along an outer axis walks it element by element; adding
+    # whole slabs keeps the inner axes vectorized
+    slabs, sums = np.moveaxis(histograms, axis, 0), np.moveaxis(cumsum, axis, 0)
+    for color in range(_COLORS_NUMBER):
+        np.add(sums[color], slabs[color], out=sums[color + 1])
+
+    return cumsum
+
+
+def _window_counts(histograms: np.ndarray, threshold: int, axis: int = -1) -> np.ndarray:
+    # uint8 subtraction wraps around, so a color u collects the pixels
+    # with values u, u + 1, ..., u + threshold modulo 256
+    width = min(threshold, _COLORS_NUMBER - 1) + 1
+    cumsum = np.moveaxis(_prefix_sums(histograms, axis), axis, -1)
+    histograms = np.moveaxis(histograms, axis, -1)
+
+    counts = np.empty_like(histograms)
+    split = _COLORS_NUMBER - width
+    np.subtract(cumsum[..., width:_COLORS_NUMBER], cumsum[..., :split], out=counts[..., :split])
+    # windows running past 255 take the whole histogram plus the wrapped head
+    np.subtract(cumsum[..., :width], cumsum[..., split:_COLORS_NUMBER], out=counts[..., split:])
+    counts[..., split:] += cumsum[..., -1:]
+
+    return np.moveaxis(counts, -1, axis)
+
+
+def _dominant_colors(histograms: np.ndarray, threshold: int, size: int) -> tuple[np.ndarray, np.ndarray]:
+    counts = _window_counts(histograms, threshold)
+    # absent colors never win, ties go to the smallest color as with np.unique
+    counts[histograms == 0] = -1
+
+    colors = np.argmax(counts, axis=1)
+    percents = counts[np.arange(counts.shape[0]), colors] / size * 100
+
+    return colors.astype(np.uint8), percents
+
+
 def get_dominant_color_info(
         image: np.ndarray[np.uint8],
         threshold: int = 5,
@@ -12,6 +80,11 @@ def get_dominant_color_info(
     if threshold < 1:
         raise ValueError
 
+    if image.dtype == np.uint8:
+        colors, percents = _dominant_colors(_color_histograms(image[np.newaxis]), threshold, image.size)
+
+        return np.uint8(colors[0]), float(percents[0])
+
     unique_colors = np.unique(image)
 
     mask = np.abs(image[:, :, np.newaxis] - unique_colors) <= threshold
@@ -22,3 +95,123 @@ def get_dominant_color_info(
     percent = (counts[index] / image.size) * 100
 
     return np.uint8(color), float(percent)
+
+
+def get_dominant_colors_info(
+        images: np.ndarray[np.uint8],
+        threshold: int = 5,
+) -> tuple[np.ndarray, np.ndarray]:
+    if threshold < 1:
+        raise ValueError
+
+    if images.ndim != 3 or images.dtype != np.uint8:
+        raise ShapeMismatchError()
+
+    return _dominant_colors(_color_histograms(images), threshold, images[0].size)
+
+
+def _frame_chunks(frames: np.ndarray, chunk_size: int):
+    # yields (first frame, pixels of shape frames x pixels x channels) with at most
+    # chunk_size pixels; only a chunk is ever copied, even for strided or memmapped frames
+    frames_number, height, width, channels_number = frames.shape
+    frame_size = height * width
+
+    if frame_size <= chunk_size:
+        step = chunk_size // frame_size
+        for first in range(0, frames_number, step):
+            chunk = frames[first:(first + step)]
+            yield first, chunk.reshape(chunk.shape[0], frame_size, channels_number)
+
+        return
+
+    rows = max(chunk_size // width, 1)
+    for i in range(frames_number):
+        for top in range(0, height, rows):
+            yield i, frames[i, top:(top + rows)].reshape(1, -1, channels_number)
+
+
+def _channel_histograms(frames: np.ndarray, chunk_size: int) -> np.ndarray:
+    frames_number, channels_number = frames.shape[0], frames.shape[-1]
+    channel_offsets = np.arange(channels_number) * _COLORS_NUMBER
+
+    histograms = np.zeros((frames_number, channels_number, _COLORS_NUMBER), dtype=np.int64)
+    for first, pixels in _frame_chunks(frames, chunk_size):
+        last = first + pixels.shape[0]
+
+        frame_offsets = np.arange(pixels.shape[0]) * channels_number * _COLORS_NUMBER
+        keys = pixels + channel_offsets + frame_offsets[:, np.newaxis, np.newaxis]
+        chunk_histograms = np.bincount(keys.ravel(), minlength=(last - first) * channels_number * _COLORS_NUMBER)
+        histograms[first:last] += chunk_histograms.reshape(last - first, channels_number, _COLORS_NUMBER)
+
+    return histograms
+
+
+def _packed_histogram(frame: np.ndarray, chunk_size: int) -> np.ndarray:
+    # int32 halves the memory of the 256 x 256 x 256 window sums
+    dtype = np.int32 if frame.shape[0] * frame.shape[1] < 2 ** 31 else np.int64
+    histogram = np.zeros(_COLORS_NUMBER ** _RGB_CHANNELS, dtype=dtype)
+
+    # the packed keys live one chunk at a time: a sorted chunk gives (key, count) runs,
+    # so memory beyond the histogram itself is bounded by chunk_size, not by the frame
+    for _, pixels in _frame_chunks(frame[np.newaxis], chunk_size):
+        chunk = pixels[0].astype(np.uint32)
+        keys = (chunk[:, 0] << 16) | (chunk[:, 1] << 8)
+        keys |= chunk[:, 2]
+        keys.sort()
+
+        boundaries = np.empty(keys.size, dtype=bool)
+        boundaries[0] = True
+        np.not_equal(keys[1:], keys[:-1], out=boundaries[1:])
+        starts = np.flatnonzero(boundaries)
+        histogram[keys[starts]] += np.diff(starts, append=keys.size).astype(dtype)
+
+    return histogram.reshape((_COLORS_NUMBER,) * _RGB_CHANNELS)
+
+
+def _dominant_packed_color(histogram: np.ndarray, threshold: int, size: int) -> tuple[np.ndarray, float]:
+    counts = histogram
+    for axis in range(_RGB_CHANNELS):
+        counts = _window_counts(counts, threshold, axis)
+    np.copyto(counts, -1, where=histogram == 0)
+
+    key = np.argmax(counts)
+    color = np.array(np.unravel_index(key, counts.shape), dtype=np.uint8)
+
+    return color, counts.flat[key] / size * 100
+
+
+def get_video_dominant_colors_info(
+        frames: np.ndarray[np.uint8],
+        threshold: int = 5,
+        mode: Union[str, ColorModes] = ColorModes.PER_CHANNEL,
+        chunk_size: int = 1 << 20,
+) -> tuple[np.ndarray, np.ndarray]:
+    mode = ColorModes(mode)
+
+    if threshold < 1 or chunk_size < 1:
+        raise ValueError
+
+    if frames.ndim != 4 or frames.dtype != np.uint8:
+        raise ShapeMismatchError()
+
+    frames_number, channels_number = frames.shape[0], frames.shape[-1]
+    frame_size = frames[0, ..., 0].size
+
+    if mode == ColorModes.PER_CHANNEL:
+        histograms = _channel_histograms(frames, chunk_size)
+        colors, percents = _dominant_colors(
+            histograms.reshape(-1, _COLORS_NUMBER), threshold, frame_size
+        )
+
+        return colors.reshape(frames_number, channels_number), percents.reshape(frames_number, channels_number)
+
+    if channels_number != _RGB_CHANNELS:
+        raise ShapeMismatchError()
+
+    colors = np.empty((frames_number, _RGB_CHANNELS), dtype=np.uint8)
+    percents = np.empty(frames_number)
+    for i in range(frames_number):
+        histogram = _packed_histogram(frames[i], chunk_size)
+        colors[i], percents[i] = _dominant_packed_color(histogram, threshold, frame_size)
+
+    return colors, percents
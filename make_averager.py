@@ -1,12 +1,14 @@
 from typing import Callable
 
+import numpy as np
+
 
 def is_floats_eq(lhs: float, rhs: float, eps: float = 1e-6) -> bool:
     return abs(lhs - rhs) < eps
 
 
 def make_averager(accumulation_period: int) -> Callable[[float], float]:
-    profits = [0] * (accumulation_period + 1)
+    profits = [0] * accumulation_period
     s = c = 0
 
     def get_avg(profit: int) -> float:
@@ -25,3 +27,114 @@ def make_averager(accumulation_period: int) -> Callable[[float], float]:
             return s / c
 
     return get_avg
+
+
+def _compensated_add(total: np.ndarray, compensation: np.ndarray, values: np.ndarray) -> None:
+    # Neumaier summation: the lost low-order bits are kept in compensation
+    new_total = total + values
+    compensation += np.where(np.abs(total) >= np.abs(values), (total - new_total) + values, (values - new_total) + total)
+    total[...] = new_total
+
+
+class RollingStatistics:
+    """
+    Rolling window statistics for many independent streams at once.
+
+    Stream k keeps its last window values in row k of a ring buffer; sums of
+    values and squares are updated incrementally with compensated summation.
+    The sums are taken over values minus a per-stream shift (the first value
+    of the stream), which keeps the variance accurate for large offsets.
+    """
+
+    _buffer: np.ndarray  # (streams, window)
+    _count: int  # values received by every stream
+    _shift: np.ndarray
+    _sum: np.ndarray
+    _sum_compensation: np.ndarray
+    _squares: np.ndarray
+    _squares_compensation: np.ndarray
+
+    def __init__(self, streams: int, window: int) -> None:
+        if streams < 1 or window < 1:
+            raise ValueError
+
+        self._buffer = np.zeros((streams, window))
+        self._count = 0
+        self._shift = np.zeros(streams)
+        self._sum = np.zeros(streams)
+        self._sum_compensation = np.zeros(streams)
+        self._squares = np.zeros(streams)
+        self._squares_compensation = np.zeros(streams)
+
+    @property
+    def streams(self) -> int:
+        return self._buffer.shape[0]
+
+    @property
+    def window(self) -> int:
+        return self._buffer.shape[1]
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Append one value per stream (shape (streams,)) or several values
+        per stream (shape (streams, m), oldest first).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+
+        if values.ndim != 2 or values.shape[0] != self.streams:
+            raise ValueError("values must have shape (streams,) or (streams, m)")
+
+        if values.shape[1] >= self.window:
+            # the whole window is replaced: start the sums over
+            self._count += values.shape[1]
+            self._buffer[...] = np.roll(values[:, -self.window:], self._count % self.window, axis=1)
+            self._shift[...] = values[:, -self.window]
+            shifted = values[:, -self.window:] - self._shift[:, np.newaxis]
+            self._sum[...] = shifted.sum(axis=1)
+            self._squares[...] = np.square(shifted).sum(axis=1)
+            self._sum_compensation[...] = 0
+            self._squares_compensation[...] = 0
+            return
+
+        if self._count == 0:
+            self._shift[...] = values[:, 0]
+
+        positions = (self._count + np.arange(values.shape[1])) % self.window
+        was_filled = self._count + np.arange(values.shape[1]) >= self.window
+        shifted = values - self._shift[:, np.newaxis]
+        evicted = np.where(was_filled, self._buffer[:, positions] - self._shift[:, np.newaxis], 0)
+
+        _compensated_add(self._sum, self._sum_compensation, shifted.sum(axis=1) - evicted.sum(axis=1))
+        _compensated_add(self._squares, self._squares_compensation,
+                         np.square(shifted).sum(axis=1) - np.square(evicted).sum(axis=1))
+
+        self._buffer[:, positions] = values
+        self._count += values.shape[1]
+
+    def _filled(self) -> int:
+        filled = min(self._count, self.window)
+        if filled == 0:
+            raise ValueError("no values were added yet")
+
+        return filled
+
+    def _window_values(self) -> np.ndarray:
+        return self._buffer[:, :self._filled()]
+
+    def mean(self) -> np.ndarray:
+        return self._shift + (self._sum + self._sum_compensation) / self._filled()
+
+    def var(self, ddof: int = 0) -> np.ndarray:
+        filled = self._filled()
+        total = self._sum + self._sum_compensation
+        squares = self._squares + self._squares_compensation
+
+        return np.maximum(squares - total * total / filled, 0) / (filled - ddof)
+
+    def min(self) -> np.ndarray:
+        return self._window_values().min(axis=1)
+
+    def max(self) -> np.ndarray:
+        return self._window_values().max(axis=1)
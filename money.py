@@ -1,4 +1,8 @@
 from calendar import month_name
+from enum import Enum
+from numbers import Real
+from typing import Iterable
+
 import numpy as np
 
 
@@ -58,3 +62,168 @@ def sort_month_names_by_profits(
     profits_sorted = np.argsort(rev * np.sum(amounts_of_sold_subscriptions * subscriptions_prices, axis=1)) + 1
 
     return [month_name[i] for i in profits_sorted]
+
+
+class _ProfitQueries:
+    """
+    Queries answered from cached per-month and per-product profits.
+    """
+
+    _month_profits: np.ndarray
+    _product_profits: np.ndarray
+
+    @property
+    def month_profits(self) -> np.ndarray:
+        return self._month_profits
+
+    @property
+    def product_profits(self) -> np.ndarray:
+        return self._product_profits
+
+    @staticmethod
+    def _month_names(indices: np.ndarray) -> list[str]:
+        return [month_name[i % 12 + 1] for i in indices]
+
+    def get_most_profitable_month_name(self) -> str:
+        return self._month_names([np.argmax(self._month_profits)])[0]
+
+    def get_mean_profit(self, strategy: Strategies | None = None) -> np.ndarray | Real:
+        months, products = len(self._month_profits), len(self._product_profits)
+
+        if months == 0:
+            raise ValueError("no sales were added yet")
+
+        if strategy is None:
+            return self._month_profits.sum() / (months * products)
+
+        if strategy == Strategies.BY_MONTH:
+            return self._month_profits / products
+
+        return self._product_profits / months
+
+    def sort_month_names_by_profits(self, ascending: bool = True) -> list[str]:
+        rev = 1 if ascending else -1
+
+        return self._month_names(np.argsort(rev * self._month_profits))
+
+    def get_top_month_names(self, k: int) -> list[str]:
+        if k < 1:
+            raise ValueError
+
+        k = min(k, len(self._month_profits))
+        top = np.argpartition(-self._month_profits, k - 1)[:k]
+
+        return self._month_names(top[np.argsort(-self._month_profits[top])])
+
+
+class SubscriptionProfits(_ProfitQueries):
+    """
+    Profit analytics over amounts of sold subscriptions (months x products).
+
+    Rows are consecutive months, possibly over several years; the data is read
+    once in row chunks, accumulating per-month and per-product profits in float64,
+    and every query is answered from these two reductions.
+    """
+
+    def __init__(
+            self,
+            amounts_of_sold_subscriptions: np.ndarray,
+            subscriptions_prices: np.ndarray,
+            chunk_rows: int = 64,
+    ) -> None:
+        if amounts_of_sold_subscriptions.ndim != 2 or subscriptions_prices.ndim != 1:
+            raise ShapeMismatchError()
+
+        if amounts_of_sold_subscriptions.shape[1] != len(subscriptions_prices):
+            raise InconsistentDataError()
+
+        if chunk_rows < 1:
+            raise ValueError
+
+        prices = np.asarray(subscriptions_prices, dtype=np.float64)
+        months = amounts_of_sold_subscriptions.shape[0]
+
+        self._month_profits = np.empty(months)
+        amounts_by_product = np.zeros(len(prices))
+
+        for start in range(0, months, chunk_rows):
+            chunk = np.asarray(amounts_of_sold_subscriptions[start:(start + chunk_rows)], dtype=np.float64)
+            self._month_profits[start:(start + chunk_rows)] = chunk @ prices
+            amounts_by_product += chunk.sum(axis=0)
+
+        self._product_profits = amounts_by_product * prices
+
+
+class StreamingSubscriptionProfits(_ProfitQueries):
+    """
+    Profit analytics built incrementally from chunks of sales rows
+    (month, product, count), so the months x products matrix never exists.
+
+    Months are numbered from 0 as rows of the matrix are; the number of months
+    grows with the largest month seen. Queries can be asked between chunks.
+    """
+
+    _prices: np.ndarray
+    _amounts_by_product: np.ndarray
+    _cached_product_profits: np.ndarray | None
+
+    def __init__(self, subscriptions_prices: np.ndarray) -> None:
+        if subscriptions_prices.ndim != 1:
+            raise ShapeMismatchError()
+
+        self._prices = np.asarray(subscriptions_prices, dtype=np.float64)
+        self._amounts_by_product = np.zeros(len(self._prices))
+        self._month_profits = np.zeros(0)
+        self._cached_product_profits = None
+
+    @property
+    def _product_profits(self) -> np.ndarray:
+        # built on the first query after an update, so that update
+        # only costs O(chunk) however many products there are
+        if self._cached_product_profits is None:
+            self._cached_product_profits = self._amounts_by_product * self._prices
+
+        return self._cached_product_profits
+
+    def update(self, sales: np.ndarray) -> None:
+        """Add one chunk of sales: an (n, 3) integer array of (month, product, count) rows."""
+        sales = np.asarray(sales)
+        if sales.ndim != 2 or sales.shape[1] != 3:
+            raise ShapeMismatchError()
+
+        if len(sales) == 0:
+            return
+
+        months, products, counts = sales[:, 0], sales[:, 1], sales[:, 2].astype(np.float64)
+
+        if months.min() < 0:
+            raise ValueError
+
+        if products.min() < 0 or products.max() >= len(self._prices):
+            raise InconsistentDataError()
+
+        month_profits = np.bincount(months, weights=counts * self._prices[products])
+        if len(month_profits) > len(self._month_profits):
+            self._month_profits = np.concatenate(
+                (self._month_profits, np.zeros(len(month_profits) - len(self._month_profits)))
+            )
+
+        self._month_profits[:len(month_profits)] += month_profits
+        np.add.at(self._amounts_by_product, products, counts)
+        self._cached_product_profits = None
+
+    def consume(self, sales: np.ndarray | Iterable[np.ndarray], chunk_rows: int = 1 << 20) -> None:
+        """
+        Add sales from an (n, 3) array, e.g. np.load(path, mmap_mode="r"),
+        read chunk_rows rows at a time, or from any iterable of such chunks.
+        """
+        if chunk_rows < 1:
+            raise ValueError
+
+        if isinstance(sales, np.ndarray):
+            chunks = (sales[start:(start + chunk_rows)] for start in range(0, len(sales), chunk_rows))
+        else:
+            chunks = sales
+
+        for chunk in chunks:
+            self.update(chunk)
@@ -19,3 +19,70 @@ def get_projections_components(
     orthogonals = np.subtract(vector, projections)
 
     return projections, orthogonals
+
+
+_SINGULAR_PROBES = 4
+
+
+def _smallest_singular_values(matrices: np.ndarray, norms: np.ndarray) -> np.ndarray:
+    # estimates of the smallest singular value of every row-normalized matrix
+    # at the cost of one LU: for a probe r, |r| / |normalized^-1 @ r| is at
+    # least that value, and normalized^-1 = matrices^-1 @ diag(norms)
+    probes = np.random.default_rng(0).standard_normal((matrices.shape[-1], _SINGULAR_PROBES))
+    right_sides = norms[..., np.newaxis] * probes
+    solutions = np.full(right_sides.shape, np.inf)
+
+    # an exactly zero pivot fails the whole batch: matrices with a zero row
+    # are left out up front, other exactly singular ones are found by slogdet
+    regular = np.all(norms > 0, axis=1)
+    try:
+        if regular.all():
+            solutions = np.linalg.solve(matrices, right_sides)
+        else:
+            solutions[regular] = np.linalg.solve(matrices[regular], right_sides[regular])
+    except np.linalg.LinAlgError:
+        regular &= np.linalg.slogdet(matrices)[0] != 0
+        solutions[regular] = np.linalg.solve(matrices[regular], right_sides[regular])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimates = np.linalg.norm(probes, axis=0) / np.linalg.norm(solutions, axis=1)
+
+    return np.min(estimates, axis=1)
+
+
+def get_projections_components_batch(
+        matrices: np.ndarray,
+        vectors: np.ndarray,
+        tol: float | None = None,
+        out: tuple[np.ndarray, np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if matrices.ndim != 3 or vectors.ndim != 2:
+        raise ShapeMismatchError()
+
+    batch, rows, columns = matrices.shape
+    if rows != columns or vectors.shape != (batch, columns):
+        raise ShapeMismatchError()
+
+    if out is None:
+        out = np.empty(matrices.shape), np.empty(matrices.shape)
+    elif out[0].shape != matrices.shape or out[1].shape != matrices.shape:
+        raise ShapeMismatchError()
+
+    projections, orthogonals = out
+    squared_norms = np.einsum("bij,bij->bi", matrices, matrices)
+
+    # a matrix is singular when its row-normalized version has a (numerically)
+    # zero singular value; unlike det == 0 this does not depend on the scale
+    if tol is None:
+        tol = columns * np.finfo(np.float64).eps
+    norms = np.sqrt(squared_norms)
+    valid = _smallest_singular_values(matrices, norms) > tol
+
+    coefficients = (matrices @ vectors[..., np.newaxis])[..., 0] / np.where(squared_norms > 0, squared_norms, 1)
+    np.multiply(matrices, coefficients[..., np.newaxis], out=projections)
+    np.subtract(vectors[:, np.newaxis, :], projections, out=orthogonals)
+
+    projections[~valid] = np.nan
+    orthogonals[~valid] = np.nan
+
+    return projections, orthogonals, valid
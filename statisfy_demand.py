@@ -14,3 +14,38 @@ def can_satisfy_demand(
         raise ShapeMismatchError()
 
     return not np.any(resource_amounts - (np.sum(demand_expected * costs, axis=1)) < 0)
+
+
+def _get_needs(
+        costs: np.ndarray,
+        resource_amounts: np.ndarray,
+        demands: np.ndarray,
+) -> np.ndarray:
+    if demands.ndim != 2 or demands.shape[1] != costs.shape[1] or len(resource_amounts) != costs.shape[0]:
+        raise ShapeMismatchError()
+
+    # costs may be any matrix supporting @, e.g. a scipy.sparse matrix
+    return np.asarray(costs @ demands.T).T
+
+
+def can_satisfy_demands(
+        costs: np.ndarray,
+        resource_amounts: np.ndarray,
+        demands: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    shortfalls = np.maximum(_get_needs(costs, resource_amounts, demands) - resource_amounts, 0)
+
+    return ~np.any(shortfalls > 0, axis=1), shortfalls
+
+
+def get_max_demand_scales(
+        costs: np.ndarray,
+        resource_amounts: np.ndarray,
+        demands: np.ndarray,
+) -> np.ndarray:
+    needs = _get_needs(costs, resource_amounts, demands)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(needs > 0, resource_amounts / needs, np.inf)
+
+    return np.maximum(ratios.min(axis=1), 0)
@@ -0,0 +1,87 @@
+import sys
+import threading
+
+import pytest
+
+from CRUD import BatchError, ConcurrentPersonDB, Person, PersonDB
+
+THREADS = 8
+ROUNDS = 200
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # switch threads every few bytecodes so that the operations really interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _check_indexes(database: PersonDB) -> None:
+    assert len(database._login_registry) == len(database._database)
+    for login, person_id in database._login_registry.items():
+        assert database._database[person_id].login == login
+
+    usernames = {}
+    for person_id, person in database._database.items():
+        usernames.setdefault(person.username, set()).add(person_id)
+    assert database._username_registry == usernames
+
+
+def _worker(database: ConcurrentPersonDB, thread: int, barrier: threading.Barrier, results: dict) -> None:
+    barrier.wait()
+    own = []
+    won = []
+
+    for i in range(ROUNDS):
+        # every thread races for the same shared login
+        try:
+            won.append(database.create_person(Person(f"shared{i}", "Passw0rd12", "Shared")))
+        except ValueError:
+            pass
+
+        person_id = database.create_person(Person(f"t{thread}n{i}", "Passw0rd12", f"Name{i % 4}"))
+        database.update_person_info(person_id, Person(f"t{thread}r{i}", "", f"Name{(i + 1) % 4}"))
+        assert database.find_by_login(f"t{thread}r{i}") == person_id
+        own.append(person_id)
+
+        if i % 10 == 9:
+            database.update_many([(own[-1], Person("", "N3wPassword", "")),
+                                  (own[-2], Person(f"t{thread}x{i}", "", ""))])
+            database.delete_many(own[-4:-2])
+            del own[-4:-2]
+
+        if i % 25 == 24:
+            with pytest.raises(BatchError):
+                database.create_many([Person(f"t{thread}b{i}", "Passw0rd12", "Batch"),
+                                      Person(f"shared{i}", "Passw0rd12", "Batch")])
+
+    results[thread] = own, won
+
+
+def test_threads_keep_indexes_consistent():
+    database = ConcurrentPersonDB(stripes=4)
+    barrier = threading.Barrier(THREADS)
+    results = {}
+    threads = [threading.Thread(target=_worker, args=(database, thread, barrier, results))
+               for thread in range(THREADS)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == THREADS
+    _check_indexes(database)
+
+    # each shared login has exactly one owner, and failed batches left nothing behind
+    winners = [person_id for _, won in results.values() for person_id in won]
+    assert len(winners) == ROUNDS
+    assert {database.read_person_info(person_id).login for person_id in winners} == \
+           {f"shared{i}" for i in range(ROUNDS)}
+    assert not database.find_by_username("Batch")
+
+    own = [person_id for owned, _ in results.values() for person_id in owned]
+    assert len(database._database) == len(own) + ROUNDS
+    assert all(person_id in database._database for person_id in own)
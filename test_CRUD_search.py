@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from CRUD import Person, SearchablePersonDB, _SortedStrings
+
+_ALPHABET = "abAB1"
+
+
+def _word(rng: random.Random, low: int, high: int) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(low, high)))
+
+
+def _person(rng: random.Random, login: str) -> Person:
+    return Person(login=login, password="Passw0rd12", username=_word(rng, 1, 6), metadata=_word(rng, 0, 6))
+
+
+def _brute_force(database: SearchablePersonDB, login_prefix: str, username_contains: str,
+                 metadata_contains: str, after=None) -> list:
+    return sorted(((person_id, person) for person_id, person in database._database.items()
+                   if person.login.startswith(login_prefix) and username_contains in person.username
+                   and metadata_contains in person.metadata and (after is None or person.login > after)),
+                  key=lambda item: item[1].login)
+
+
+def _mutate(database: SearchablePersonDB, rng: random.Random) -> set:
+    """Applies one random change and returns the ids it created, changed or deleted."""
+    ids = list(database._database)
+    action = rng.randrange(5)
+    login = _word(rng, 1, 5)
+
+    if action == 0 or len(ids) < 4:
+        if login in database._login_registry:
+            return set()
+        return {database.create_person(_person(rng, login))}
+
+    if action == 1:
+        logins = {_word(rng, 1, 5) for _ in range(rng.randint(1, 30))} - database._login_registry.keys()
+        return set(database.create_many([_person(rng, login) for login in logins]))
+
+    if action == 2:
+        person_id = rng.choice(ids)
+        new_login = login if login not in database._login_registry else ""
+        database.update_person_info(person_id, Person(new_login, "", _word(rng, 0, 6), _word(rng, 0, 6)))
+        return {person_id}
+
+    if action == 3:
+        person_id = rng.choice(ids)
+        database.delete_person(person_id)
+        return {person_id}
+
+    person_ids = rng.sample(ids, 2)
+    database.delete_many(person_ids)
+    return set(person_ids)
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # tiny blocks make every few insertions split a block and deletions empty one
+    monkeypatch.setattr(_SortedStrings, "_block_size", 2)
+
+
+@pytest.mark.parametrize("dense_ratio", [0, 1 / 16, 2])
+def test_search_matches_brute_force(small_blocks, dense_ratio):
+    rng = random.Random(dense_ratio)
+    database = SearchablePersonDB()
+    database._dense_candidates_ratio = dense_ratio
+
+    for step in range(300):
+        _mutate(database, rng)
+
+        login_prefix = rng.choice(["", _word(rng, 1, 2)])
+        username_contains = rng.choice(["", _word(rng, 1, 2), _word(rng, 3, 4)])
+        metadata_contains = rng.choice(["", _word(rng, 3, 3)])
+        after = rng.choice([None, _word(rng, 1, 3)])
+
+        assert list(database.search(login_prefix, username_contains, metadata_contains, after)) == \
+               _brute_force(database, login_prefix, username_contains, metadata_contains, after)
+
+
+@pytest.mark.parametrize("username_contains", ["", "a", "aba"])
+def test_cursor_pages_under_mutation(small_blocks, username_contains):
+    rng = random.Random(username_contains)
+    database = SearchablePersonDB()
+    database.create_many([_person(rng, login) for login in {_word(rng, 1, 5) for _ in range(300)}])
+
+    for _ in range(10):
+        initial = {person_id: person.login for person_id, person in _brute_force(database, "", username_contains, "")}
+        touched = set()
+        seen = []
+        cursor = None
+
+        while True:
+            page, cursor = database.search_page(username_contains=username_contains, cursor=cursor, page_size=7)
+            seen.extend(page)
+
+            if cursor is None:
+                break
+
+            # records changed between pages have no guarantee; everything else must be seen once
+            for _ in range(3):
+                touched |= _mutate(database, rng)
+
+        logins = [person.login for _, person in seen]
+        assert logins == sorted(set(logins))
+
+        seen_ids = {person_id for person_id, _ in seen}
+        assert {person_id for person_id in initial if person_id not in touched} <= seen_ids
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sorted_strings_matches_sorted_list(small_blocks, seed):
+    rng = random.Random(seed)
+    strings = _SortedStrings()
+    expected = []
+
+    for _ in range(2000):
+        action = rng.random()
+
+        if not expected or (action < 0.45 and len(expected) < 200):
+            value = _word(rng, 1, 4)
+            strings.add(value)
+            expected.append(value)
+        elif action < 0.5 and len(expected) < 200:
+            # both the insertion path of small batches and the rebuild of large ones
+            values = [_word(rng, 1, 4) for _ in range(rng.choice([1, 3, len(expected) // 4 + 1]))]
+            strings.update(values)
+            expected.extend(values)
+        else:
+            value = rng.choice(expected)
+            strings.remove(value)
+            expected.remove(value)
+
+        expected.sort()
+        assert list(strings) == expected
+        assert len(strings) == len(expected)
+        assert all(0 < len(block) <= 2 * _SortedStrings._block_size for block in strings._blocks)
+        assert strings._maxes == [block[-1] for block in strings._blocks]
+
+        probe = _word(rng, 0, 4)
+        for inclusive in (True, False):
+            following = [value for value in expected if value > probe or (inclusive and value == probe)]
+            assert strings.next(probe, inclusive) == (following[0] if following else None)
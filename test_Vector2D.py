@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from Vector2D import Vector2DArray
+
+
+@pytest.fixture
+def vectors():
+    return Vector2DArray(np.array([1.0, -2.0, 3.5]), np.array([0.5, 4.0, -1.0]))
+
+
+@pytest.mark.parametrize("left", [np.float64(2.0), np.array([1.0, 2.0, 3.0])])
+def test_numpy_operand_on_the_left(vectors, left):
+    # np.float64 is what reductions such as np.sum return
+    for result, expected in (
+            (left * vectors, vectors * left),
+            (left + vectors, vectors + left),
+            (left - vectors, -vectors + left),
+    ):
+        assert isinstance(result, Vector2DArray)
+        np.testing.assert_array_equal(result.abscissa, expected.abscissa)
+        np.testing.assert_array_equal(result.ordinate, expected.ordinate)
+
+
+def test_reduction_result_scales_vectors(vectors):
+    scaled = np.sum(np.ones(4)) * vectors
+
+    assert isinstance(scaled, Vector2DArray)
+    np.testing.assert_array_equal(scaled.abscissa, 4 * vectors.abscissa)
+
+
+def test_in_place_operators_leave_caller_arrays_alone():
+    x = np.array([1.0, 2.0])
+    y = np.array([3.0, 4.0])
+
+    vectors = Vector2DArray(x, x)
+    vectors *= 2
+    vectors += Vector2DArray(y, y)
+
+    np.testing.assert_array_equal(vectors.abscissa, [5.0, 8.0])
+    np.testing.assert_array_equal(vectors.ordinate, [5.0, 8.0])
+    np.testing.assert_array_equal(x, [1.0, 2.0])
+    np.testing.assert_array_equal(y, [3.0, 4.0])
+
+
+def test_from_arrays_wraps_without_copying():
+    data = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+    vectors = Vector2DArray.from_arrays(data[0], data[1])
+    vectors *= 2
+    np.testing.assert_array_equal(data, [[2.0, 4.0], [6.0, 8.0]])
+
+    # interleaved components share a buffer but not a single element
+    packed = np.arange(6.0)
+    Vector2DArray.from_arrays(packed[0::2], packed[1::2])
+
+
+@pytest.mark.parametrize("components", [
+    lambda x: (x, x),
+    lambda x: (x, x[::-1]),
+    lambda x: (x[:3], x[1:]),
+])
+def test_from_arrays_rejects_overlapping_components(components):
+    with pytest.raises(ValueError):
+        Vector2DArray.from_arrays(*components(np.arange(4.0)))
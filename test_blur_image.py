@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from blur_image import BlurEngines, ParallelBackends, blur_image, blur_image_parallel, blur_images
+
+
+def _random_image(shape, dtype, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=shape).astype(dtype)
+
+
+@pytest.mark.parametrize("backend", list(ParallelBackends))
+@pytest.mark.parametrize("shape", [(37, 23), (50, 40, 3)])
+@pytest.mark.parametrize("dtype", [np.uint8, np.int32])
+def test_parallel_bands_match_blur_image(backend, shape, dtype):
+    image = _random_image(shape, dtype)
+
+    for kernel_size in (3, 7):
+        expected = blur_image(image, kernel_size, BlurEngines.SEPARABLE)
+
+        # bands smaller than the halo, equal to it and not dividing the height
+        for band_height in (1, kernel_size // 2, 5, 64):
+            result = blur_image_parallel(image, kernel_size, workers=2, backend=backend, band_height=band_height)
+
+            assert result.dtype == image.dtype
+            np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("backend", list(ParallelBackends))
+def test_parallel_float_matches_up_to_rounding(backend):
+    image = np.random.default_rng(1).random((31, 17, 3))
+
+    np.testing.assert_allclose(
+        blur_image_parallel(image, 5, workers=2, backend=backend, band_height=4),
+        blur_image(image, 5, BlurEngines.SEPARABLE),
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("backend", list(ParallelBackends))
+def test_stack_matches_blur_image(backend):
+    images = _random_image((5, 19, 21, 3), np.uint8)
+
+    result = blur_images(images, 5, workers=2, backend=backend)
+
+    for image, blured in zip(images, result):
+        np.testing.assert_array_equal(blured, blur_image(image, 5, BlurEngines.SEPARABLE))
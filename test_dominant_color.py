@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from dominant_color import get_dominant_color_info, get_dominant_colors_info
+
+
+def _broadcast_dominant_color_info(image: np.ndarray, threshold: int) -> tuple[np.uint8, float]:
+    # the original implementation, kept as the reference for the histogram path
+    unique_colors = np.unique(image)
+
+    mask = np.abs(image[:, :, np.newaxis] - unique_colors) <= threshold
+    counts = np.sum(mask, axis=(0, 1))
+    index = np.argmax(counts)
+    color = unique_colors[index]
+
+    percent = (counts[index] / image.size) * 100
+
+    return np.uint8(color), float(percent)
+
+
+def _random_images(seed: int, number: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(number):
+        height, width = rng.integers(1, 40, size=2)
+        low = rng.integers(0, 256)
+        high = rng.integers(low + 1, 257)
+        images.append(rng.integers(low, high, size=(height, width), dtype=np.uint8))
+
+    return images
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_histogram_matches_broadcast(seed):
+    rng = np.random.default_rng(seed)
+
+    for image in _random_images(seed, 40):
+        # thresholds beyond 255 exercise the full wrap-around window
+        threshold = int(rng.choice([1, 2, 5, 17, 128, 255, 300]))
+
+        color, percent = get_dominant_color_info(image, threshold)
+        expected_color, expected_percent = _broadcast_dominant_color_info(image, threshold)
+
+        assert color == expected_color
+        assert percent == expected_percent
+
+
+def test_wrap_around_and_ties():
+    # 250 + 10 wraps to 4, so 250 collects the 3s and beats the 3 pixels themselves
+    image = np.array([[250, 3, 3], [100, 101, 250]], dtype=np.uint8)
+    assert get_dominant_color_info(image, 10) == _broadcast_dominant_color_info(image, 10)
+
+    # equal counts go to the smallest color
+    image = np.array([[10, 200]], dtype=np.uint8)
+    assert get_dominant_color_info(image, 1) == (np.uint8(10), 50.0)
+
+
+def test_stack_matches_broadcast():
+    rng = np.random.default_rng(42)
+    images = rng.integers(0, 256, size=(16, 24, 31), dtype=np.uint8)
+
+    for threshold in (1, 5, 64):
+        colors, percents = get_dominant_colors_info(images, threshold)
+
+        for image, color, percent in zip(images, colors, percents):
+            assert (color, percent) == _broadcast_dominant_color_info(image, threshold)